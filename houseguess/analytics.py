@@ -0,0 +1,319 @@
+"""
+Project: HouseGuess
+Authors: Preeth Vijay, Haytham Moussa, Connor Pollack, Victor Ortiz Nazario, Sam Appiah, Collin Poag
+Date: 9/21/2025
+Description: This file contains streaming score analytics with mergeable quantile sketches
+"""
+
+# Libraries
+from __future__ import annotations
+import heapq
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch: any quantile is within relative error alpha of the true value.
+    Memory is capped at max_buckets (the smallest buckets are folded together past that), and two
+    sketches with the same alpha merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, alpha: float = 0.01, max_buckets: int = 2048):
+        """Initialize empty sketch"""
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0  # values too small to bucket (exact-hit guesses)
+        self.count = 0
+
+    def add(self, x: float, n: int = 1):
+        """Record value x (must be >= 0) n times"""
+        self.count += n
+        if x <= 1e-9:
+            self.zero_count += n
+            return
+        k = math.ceil(math.log(x) / self._log_gamma)
+        self.buckets[k] = self.buckets.get(k, 0) + n
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        """Fold the lowest buckets together until under max_buckets (keeps upper quantiles accurate)"""
+        keys = sorted(self.buckets)
+        extra = len(keys) - self.max_buckets
+        into = keys[extra]
+        for k in keys[:extra]:
+            self.buckets[into] += self.buckets.pop(k)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), None if empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if rank < seen:
+                return 2 * self._gamma ** k / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def merge(self, other: QuantileSketch):
+        """Add other's values into this sketch"""
+        if other.alpha != self.alpha:
+            raise ValueError("Cannot merge sketches with different alpha")
+        for k, n in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form"""
+        return {"alpha": self.alpha, "max_buckets": self.max_buckets, "zero_count": self.zero_count,
+                "count": self.count, "buckets": {str(k): n for k, n in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> QuantileSketch:
+        """Rebuild from to_dict() output"""
+        sketch = cls(d["alpha"], d["max_buckets"])
+        sketch.zero_count = d["zero_count"]
+        sketch.count = d["count"]
+        sketch.buckets = {int(k): n for k, n in d["buckets"].items()}
+        return sketch
+
+class RunningStats:
+    """Count, mean, min and max updated one value at a time; mergeable."""
+
+    def __init__(self):
+        """Initialize empty"""
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float):
+        """Record value x"""
+        self.count += 1
+        self.mean += (x - self.mean) / self.count
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def merge(self, other: RunningStats):
+        """Add other's values into these stats"""
+        total = self.count + other.count
+        if total:
+            self.mean = (self.mean * self.count + other.mean * other.count) / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form"""
+        return {"count": self.count, "mean": self.mean,
+                "min": None if self.count == 0 else self.min, "max": None if self.count == 0 else self.max}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> RunningStats:
+        """Rebuild from to_dict() output"""
+        stats = cls()
+        stats.count, stats.mean = d["count"], d["mean"]
+        if stats.count:
+            stats.min, stats.max = d["min"], d["max"]
+        return stats
+
+class RoundStats:
+    """Distance sketch plus distance/score running stats for one player, one game, or everyone."""
+
+    def __init__(self, alpha: float = 0.01):
+        """Initialize empty"""
+        self.distance = QuantileSketch(alpha)
+        self.distance_stats = RunningStats()
+        self.score_stats = RunningStats()
+
+    def add(self, distance_km: float, score: int):
+        """Record one round"""
+        self.distance.add(distance_km)
+        self.distance_stats.add(distance_km)
+        self.score_stats.add(score)
+
+    def merge(self, other: RoundStats):
+        """Add other's rounds"""
+        self.distance.merge(other.distance)
+        self.distance_stats.merge(other.distance_stats)
+        self.score_stats.merge(other.score_stats)
+
+    def summary(self) -> Dict[str, Any]:
+        """Rounds, means and distance quantiles"""
+        return {"rounds": self.distance_stats.count, "mean_distance_km": self.distance_stats.mean,
+                "p50_distance_km": self.distance.quantile(0.5), "p90_distance_km": self.distance.quantile(0.9),
+                "mean_score": self.score_stats.mean}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form"""
+        return {"distance": self.distance.to_dict(), "distance_stats": self.distance_stats.to_dict(),
+                "score_stats": self.score_stats.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> RoundStats:
+        """Rebuild from to_dict() output"""
+        stats = cls(d["distance"]["alpha"])
+        stats.distance = QuantileSketch.from_dict(d["distance"])
+        stats.distance_stats = RunningStats.from_dict(d["distance_stats"])
+        stats.score_stats = RunningStats.from_dict(d["score_stats"])
+        return stats
+
+class _SpaceSaving:
+    """
+    Decides which entries of a capped table to keep (Space-Saving): each entry's rank is its plays
+    plus the rank of the entries evicted before it arrived, so a new entry starts level with the
+    weakest survivors instead of being the first to go, and stale entries are displaced over time.
+    """
+
+    def __init__(self, limit: int):
+        """Initialize for a table of at most limit entries (plus 10% slack between trims)"""
+        self.limit = limit
+        self.floor = 0
+        self.rank: Dict[str, int] = {}
+
+    def hit(self, key: str):
+        """Count one play of key"""
+        self.rank[key] = self.rank.get(key, self.floor) + 1
+
+    def trim(self, table: Dict[str, Any]):
+        """Once table grows 10% past limit, drop the lowest ranked entries down to limit"""
+        if len(table) <= self.limit * 1.1:
+            return
+        for key in heapq.nsmallest(len(table) - self.limit, table, key=lambda k: self.rank.get(k, 0)):
+            del table[key]
+            self.floor = max(self.floor, self.rank.pop(key, 0))
+
+    def merge(self, other: _SpaceSaving):
+        """Combine ranks; a key missing from one side counts as that side's floor"""
+        for key in self.rank.keys() | other.rank.keys():
+            self.rank[key] = self.rank.get(key, self.floor) + other.rank.get(key, other.floor)
+        self.floor += other.floor
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form"""
+        return {"limit": self.limit, "floor": self.floor, "rank": self.rank}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> _SpaceSaving:
+        """Rebuild from to_dict() output"""
+        kept = cls(d["limit"])
+        kept.floor = d["floor"]
+        kept.rank = dict(d["rank"])
+        return kept
+
+class ScoreAnalytics:
+    """
+    Incremental round analytics fed by App.record_result: overall and per-player distance
+    quantiles and means, plus per-place mean distance for finding the hardest places.
+    Memory is bounded (sketches are fixed size; past the caps the least played players/places are
+    evicted Space-Saving style, so newcomers still get in) and instances from different processes combine with merge() or via to_dict()/from_dict().
+    """
+
+    def __init__(self, alpha: float = 0.01, max_players: int = 10_000, max_places: int = 200_000):
+        """Initialize empty analytics"""
+        self.alpha = alpha
+        self.max_players = max_players
+        self.max_places = max_places
+        self.overall = RoundStats(alpha)
+        self.players: Dict[str, RoundStats] = {}
+        self.places: Dict[str, RunningStats] = {}
+        self._player_kept = _SpaceSaving(max_players)
+        self._place_kept = _SpaceSaving(max_places)
+
+    def record(self, distance_km: float, score: int, player: Optional[str] = None, place_id: Optional[str] = None):
+        """Add one round's result"""
+        self.overall.add(distance_km, score)
+        if player is not None:
+            stats = self.players.get(player)
+            if stats is None:
+                stats = self.players[player] = RoundStats(self.alpha)
+            stats.add(distance_km, score)
+            self._player_kept.hit(player)
+            self._player_kept.trim(self.players)
+        if place_id is not None:
+            stats = self.places.get(place_id)
+            if stats is None:
+                stats = self.places[place_id] = RunningStats()
+            stats.add(distance_km)
+            self._place_kept.hit(place_id)
+            self._place_kept.trim(self.places)
+
+    def summary(self, player: Optional[str] = None) -> Dict[str, Any]:
+        """Rounds, mean distance/score and p50/p90 distance for player (or everyone)"""
+        stats = self.overall if player is None else self.players.get(player)
+        return (stats or RoundStats(self.alpha)).summary()
+
+    def hardest_places(self, k: int = 10, min_rounds: int = 5) -> List[Tuple[str, float, int]]:
+        """(place id, mean distance km, rounds) for the k places with the worst mean distance"""
+        eligible = ((pid, s.mean, s.count) for pid, s in self.places.items() if s.count >= min_rounds)
+        return heapq.nlargest(k, eligible, key=lambda e: e[1])
+
+    def merge(self, other: ScoreAnalytics):
+        """Add another instance's rounds (e.g. from another process) into this one"""
+        self.overall.merge(other.overall)
+        for player, stats in other.players.items():
+            if player in self.players:
+                self.players[player].merge(stats)
+            else:
+                self.players[player] = RoundStats.from_dict(stats.to_dict())
+        for pid, stats in other.places.items():
+            self.places.setdefault(pid, RunningStats()).merge(stats)
+        self._player_kept.merge(other._player_kept)
+        self._place_kept.merge(other._place_kept)
+        self._player_kept.trim(self.players)
+        self._place_kept.trim(self.places)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form"""
+        return {"alpha": self.alpha, "max_players": self.max_players, "max_places": self.max_places,
+                "overall": self.overall.to_dict(),
+                "player_kept": self._player_kept.to_dict(), "place_kept": self._place_kept.to_dict(),
+                "players": {p: s.to_dict() for p, s in self.players.items()},
+                "places": {p: s.to_dict() for p, s in self.places.items()}}
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> ScoreAnalytics:
+        """Rebuild from to_dict() output"""
+        analytics = cls(d["alpha"], d["max_players"], d["max_places"])
+        analytics.overall = RoundStats.from_dict(d["overall"])
+        analytics.players = {p: RoundStats.from_dict(s) for p, s in d["players"].items()}
+        analytics.places = {p: RunningStats.from_dict(s) for p, s in d["places"].items()}
+        if "place_kept" in d:
+            analytics._player_kept = _SpaceSaving.from_dict(d["player_kept"])
+            analytics._place_kept = _SpaceSaving.from_dict(d["place_kept"])
+        else:  # saved before eviction ranks were kept: start from play counts
+            analytics._player_kept.rank = {p: s.distance_stats.count for p, s in analytics.players.items()}
+            analytics._place_kept.rank = {p: s.count for p, s in analytics.places.items()}
+        return analytics
+
+    def save(self, path: str):
+        """Write to a JSON file (atomically, so a crash never leaves half a file)"""
+        if folder := os.path.dirname(path):
+            os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    def save_merged(self, path: str):
+        """Add this instance's rounds to the file at path (created if missing), e.g. once per game process"""
+        total = ScoreAnalytics.load(path) if os.path.exists(path) else ScoreAnalytics(self.alpha, self.max_players, self.max_places)
+        total.merge(self)
+        total.save(path)
+
+    @classmethod
+    def load(cls, path: str) -> ScoreAnalytics:
+        """Read from a JSON file written by save()"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
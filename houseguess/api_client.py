@@ -6,15 +6,15 @@ Description: This file allows HouseGuess to make requests to the Maps Data API h
 """
 
 # Libraries
+from __future__ import annotations
 import os
-import time
 import requests
 import re    # haytham: for address parsing fallback
-from __future__ import annotations
 from typing import Any, Dict, List, Optional, Tuple
 from .models import Place, Photo
 from .models import RapidAPIConfig
-from .util import download_img
+from .archive import open_archive
+from .util import CancelToken, download_imgs, photo_url, preview_size
 
 def _pick(d: Dict[str, Any], *keys, default=None):
     """Parse API response for data"""
@@ -39,8 +39,12 @@ def _extract_lat_lon(j: Dict[str, Any]) -> Optional[Tuple[float, float]]:
         return float(c["lat"]), float(c.get("lon", c.get("lng")))
     return None
 
-def rapidapi_search(config: RapidAPIConfig, query: str, country: Optional[str] = None, limit: int = 5, extra_params: Optional[dict] = None) -> list[Place]:
-    """Function to create and send search to Maps Data API endpoint"""
+def rapidapi_search(config: RapidAPIConfig, query: str, country: Optional[str] = None, limit: int = 5, extra_params: Optional[dict] = None,
+                    cancel: Optional[CancelToken] = None, fetch_previews: bool = True) -> list[Place]:
+    """
+    Function to create and send search to Maps Data API endpoint. Cancelling the token stops photo downloads.
+    fetch_previews=False keeps photo URLs only (bulk harvesting).
+    """
     endpoint = f"{config.endpoint}{config.search_path}"
     params: Dict[str, Any] = {"query": query, "limit": limit}
     if country:
@@ -51,18 +55,26 @@ def rapidapi_search(config: RapidAPIConfig, query: str, country: Optional[str] =
     headers = {"x-rapidapi-key": config.key, "x-rapidapi-host": config.host}
 
     # haytham: debug (disable later if noisy)
-    print(f"[DEBUG] GET {endpoint}")
+    print(f"[DEBUG] GET {endpoint} (mode={config.mode})")
     print(f"[DEBUG] params={params}")
     print(f"[DEBUG] host={config.host}, key_present={bool(config.key)}")
 
-    r = requests.get(endpoint, headers=headers, params=params, timeout=config.timeout)
-    if r.status_code >= 400:
-        print(f"[DEBUG] status={r.status_code} body={r.text[:500]}")
-        if r.status_code == 403:
-            raise RuntimeError("RapidAPI 403: Not subscribed or wrong app/key for maps-data.")
-        r.raise_for_status()
+    # API_MODE: replay serves the recorded response, record saves the live one
+    archive = open_archive(config)
+    if archive is not None and archive.replaying:
+        data = archive.load_search(endpoint, params)
+    else:
+        r = requests.get(endpoint, headers=headers, params=params, timeout=config.timeout)
+        if r.status_code >= 400:
+            print(f"[DEBUG] status={r.status_code} body={r.text[:500]}")
+            if r.status_code == 403:
+                raise RuntimeError("RapidAPI 403: Not subscribed or wrong app/key for maps-data.")
+            r.raise_for_status()
+
+        data = r.json()
+        if archive is not None:
+            archive.save_search(endpoint, params, data)
 
-    data = r.json()
     items = data.get("results") or data.get("items") or data.get("data") or data.get("result") or []
     if isinstance(items, dict):
         items = items.get("items", [])
@@ -70,6 +82,7 @@ def rapidapi_search(config: RapidAPIConfig, query: str, country: Optional[str] =
         items = []
 
     out: list[Place] = []
+    previews: list[Tuple[Photo, str]] = []
 
     for it in items:
         coords = _extract_lat_lon(it)
@@ -77,8 +90,9 @@ def rapidapi_search(config: RapidAPIConfig, query: str, country: Optional[str] =
             continue
         lat, lon = coords
 
-        pid = str(_pick(it, "place_id", "id", "ref", default=f"rapidapi:{lat},{lon}:{int(time.time())}"))
         name = _pick(it, "name", "title", default="Unknown")
+        # Fallback id depends only on the result itself, so re-harvesting the same place dedupes
+        pid = str(_pick(it, "place_id", "id", "ref", default=f"rapidapi:{float(lat):.5f},{float(lon):.5f}:{name}"))
         addr = _pick(it, "formatted_address", "address", "vicinity", default="") or ""
 
         # primary keys from payload
@@ -104,14 +118,11 @@ def rapidapi_search(config: RapidAPIConfig, query: str, country: Optional[str] =
             if url:
                 max_width = ph.get("max_size")[0]
                 max_height = ph.get("max_size")[1]
-                suffix = url.rindex("=")
-                url = f"{url[:suffix + 1]}w{max_width}-h{max_height}"
-                if file_path := download_img(url):
-                    photo = Photo(file_path=file_path, width=max_width, height=max_height)
-                    print("[DEBUG] photo:", photo)
-                    photos.append(photo)
-                else:
-                    print("[DEBUG] Failed to get image...")
+                # Only the small preview is fetched (below); the GUI loads full resolution when shown
+                photo = Photo(file_path="", width=max_width, height=max_height, url=photo_url(url, max_width, max_height))
+                if fetch_previews:
+                    previews.append((photo, photo_url(url, *preview_size(max_width, max_height))))
+                photos.append(photo)
     
         place_link = _pick(it, "place_link", "place_url", default="")
         place = Place(pid, name, str(country_val), float(lat), float(lon), place_link, address=addr, categories=cats, photos=photos)
@@ -122,6 +133,14 @@ def rapidapi_search(config: RapidAPIConfig, query: str, country: Optional[str] =
             place.website = str(website)
 
         out.append(place)
+
+    # All previews download at once under one deadline, so one slow host cannot stall the search
+    paths = download_imgs([u for _, u in previews], timeout=config.timeout, cancel=cancel, archive=archive)
+    for (photo, _), path in zip(previews, paths):
+        photo.preview_path = path or None
+        if not path:
+            print("[DEBUG] Failed to get preview image...")
+        print("[DEBUG] photo:", photo)
     print("[DEBUG] place count:", len(out))
     return out
 
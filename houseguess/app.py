@@ -9,7 +9,8 @@ Description: This file contains initialization functionality for HouseGuess
 import os
 from dotenv import load_dotenv
 from .gui import App
-from .models import RapidAPIConfig
+from .models import API_MODE_LIVE, RapidAPIConfig, read_dataset
+from .sampler import PlaceSampler
 
 def HouseGuessMain():
     """Function to initialize API configuration from .env file and start HouseGuess"""
@@ -18,14 +19,19 @@ def HouseGuessMain():
     except Exception:
         print(".env file not found. Environment variables need to be set for HouseGuess to work properly.")
 
-    # Config (override via .env)
-    RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "")
-    RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST", "maps-data.p.rapidapi.com")
-    RAPIDAPI_BASE = os.getenv("RAPIDAPI_BASE", f"https://{RAPIDAPI_HOST}")
-    RAPIDAPI_SEARCH_PATH = os.getenv("RAPIDAPI_SEARCH_PATH", "/searchmaps.php")
-    DEFAULT_TIMEOUT = (5, 20)
+    # Config (override via .env). API_MODE picks live, record or replay.
+    config = RapidAPIConfig.from_env()
+    if config.mode != API_MODE_LIVE:
+        print(f"API_MODE={config.mode} (archive: {config.archive_dir})")
 
-    config = RapidAPIConfig(RAPIDAPI_KEY, RAPIDAPI_HOST, RAPIDAPI_BASE, RAPIDAPI_SEARCH_PATH, DEFAULT_TIMEOUT)
+    # PLACES_DATASET=<harvested .jsonl> draws rounds from an offline place pool
+    sampler = None
+    if dataset := os.getenv("PLACES_DATASET"):
+        sampler = PlaceSampler(read_dataset(dataset))
+        print(f"Loaded {len(sampler.places)} places from {dataset}")
 
-    app = App(config)
+    # UI_MONITOR=1 profiles event-loop stalls and writes assets/ui_stalls.txt on exit
+    # ANALYTICS_PATH collects round stats across runs (empty disables)
+    analytics_path = os.getenv("ANALYTICS_PATH", "assets/analytics.json") or None
+    app = App(config, monitor=os.getenv("UI_MONITOR", "0") == "1", sampler=sampler, analytics_path=analytics_path)
     app.mainloop()
@@ -0,0 +1,108 @@
+"""
+Project: HouseGuess
+Authors: Preeth Vijay, Haytham Moussa, Connor Pollack, Victor Ortiz Nazario, Sam Appiah, Collin Poag
+Date: 9/21/2025
+Description: This file contains the on-disk archive used by API_MODE record and replay
+"""
+
+# Libraries
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from .models import API_MODE_LIVE, API_MODE_RECORD, API_MODE_REPLAY, RapidAPIConfig
+
+class ArchiveMiss(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+class ApiArchive:
+    """
+    Stores search responses and images keyed by request so a recorded session can be replayed
+    without touching the network. Layout: <root>/searches/<key>.json and <root>/images/<key>.img
+    """
+
+    def __init__(self, root: str, mode: str = API_MODE_RECORD, latency: float = 0.0):
+        """Initialize archive rooted at root (created on first write)"""
+        self.root = root
+        self.mode = mode
+        self.latency = latency
+
+    @property
+    def recording(self) -> bool:
+        """True when live responses should be saved"""
+        return self.mode == API_MODE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        """True when responses must come from the archive only"""
+        return self.mode == API_MODE_REPLAY
+
+    @staticmethod
+    def _key(*parts: Any) -> str:
+        """Stable hash of a request (params are sorted so dict order does not matter)"""
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, kind: str, key: str, ext: str) -> str:
+        """Path of an archived entry"""
+        return os.path.join(self.root, kind, f"{key}.{ext}")
+
+    def _write(self, path: str, data: bytes):
+        """Write atomically so an interrupted recording never leaves half a file behind"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _delay(self):
+        """Injected replay latency"""
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def save_search(self, endpoint: str, params: Dict[str, Any], data: Any):
+        """Record the JSON body returned for a search"""
+        entry = {"endpoint": endpoint, "params": params, "response": data}
+        path = self._path("searches", self._key(endpoint, params), "json")
+        self._write(path, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+    def load_search(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Return the recorded JSON body for a search"""
+        path = self._path("searches", self._key(endpoint, params), "json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            raise ArchiveMiss(f"No recorded search for {endpoint} params={params}; record it with API_MODE=1 first.") from None
+        self._delay()
+        return entry["response"]
+
+    def save_image(self, url: str, data: bytes) -> str:
+        """Record image bytes downloaded from url and return the archived path"""
+        path = self._path("images", self._key(url), "img")
+        self._write(path, data)
+        return path
+
+    def image_path(self, url: str) -> str:
+        """Return the archived file for url"""
+        path = self.image_paths([url])[0]
+        if path is None:
+            raise ArchiveMiss(f"No recorded image for {url}")
+        return path
+
+    def image_paths(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        Archived file for each url (None if never recorded). Live batches download concurrently,
+        so the replay latency is paid once per batch, not once per image.
+        """
+        paths = [self._path("images", self._key(url), "img") for url in urls]
+        self._delay()
+        return [path if os.path.exists(path) else None for path in paths]
+
+def open_archive(config: RapidAPIConfig) -> Optional[ApiArchive]:
+    """Archive for the configured API_MODE, or None when running live"""
+    if config.mode == API_MODE_LIVE:
+        return None
+    return ApiArchive(config.archive_dir, mode=config.mode, latency=config.replay_latency)
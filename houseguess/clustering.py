@@ -0,0 +1,194 @@
+"""
+Project: HouseGuess
+Authors: Preeth Vijay, Haytham Moussa, Connor Pollack, Victor Ortiz Nazario, Sam Appiah, Collin Poag
+Date: 9/21/2025
+Description: This file contains zoom-dependent grid clustering used to draw thousands of map points at once
+"""
+
+# Libraries
+from __future__ import annotations
+import heapq
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from math import asinh, atan2, log2, pi, radians, tan
+from typing import Dict, Iterable, List, Tuple
+
+TILE_SIZE = 256  # px per OSM tile
+MAX_LAT = 85.05112878  # web mercator limit
+
+# Guess lines into one answer cell are bundled per compass sector (a fan of at most this many spokes)
+FAN_SECTORS = 16
+# Most bundled lines drawn at once (heaviest first); keeps a zoomed-out view cheap to draw
+MAX_VISIBLE_SEGMENTS = 400
+# Zoom levels kept built at once (least recently used is dropped)
+MAX_CACHED_ZOOMS = 6
+
+# Grid cell of a cluster at a given zoom
+CellKey = Tuple[int, int]
+# Answer cell plus compass sector of a bundle of guess lines
+SegmentKey = Tuple[CellKey, int]
+
+def project(lat: float, lon: float) -> Tuple[float, float]:
+    """Web mercator position in [0, 1) x [0, 1) (multiply by 2**zoom for OSM tile coordinates)"""
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    x = (lon + 180.0) / 360.0
+    y = (1.0 - asinh(tan(radians(lat))) / pi) / 2.0
+    return x, y
+
+def cell_scale(zoom: int, cell_px: int) -> float:
+    """Grid cells per world unit at zoom"""
+    return TILE_SIZE * (2 ** zoom) / cell_px
+
+@dataclass
+class Cluster:
+    """Points sharing one grid cell, drawn as a single marker at their centroid"""
+
+    key: CellKey
+    count: int
+    x: float
+    y: float
+
+    def radius(self) -> float:
+        """Marker radius in px, growing slowly with the number of points"""
+        return min(22.0, 5.0 + 3.0 * log2(self.count))
+
+@dataclass
+class Segment:
+    """Guess lines into one answer cell from roughly the same direction, drawn as one spoke"""
+
+    key: SegmentKey
+    count: int
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+
+    def width(self) -> float:
+        """Line width in px, growing slowly with the number of lines"""
+        return min(6.0, 1.0 + log2(self.count))
+
+class ClusterIndex:
+    """
+    Points bucketed on a grid whose cells are cell_px wide at the current zoom. Clusters (and
+    guess-to-answer lines bundled into a fan per answer cell) are built once per zoom level and
+    cached for the most recent zoom levels, and the cells in a viewport can be looked up without
+    scanning every point. build() may run on a worker thread so the UI never waits on a new zoom.
+    """
+
+    def __init__(self, points: Iterable[Tuple[float, float]] = (),
+                 segments: Iterable[Tuple[float, float, float, float]] = (), cell_px: int = 48,
+                 max_zooms: int = MAX_CACHED_ZOOMS):
+        """Initialize from (lat, lon) points and (guess_lat, guess_lon, answer_lat, answer_lon) segments"""
+        self.cell_px = cell_px
+        self.max_zooms = max_zooms
+        self._xs, self._ys = array("d"), array("d")
+        for lat, lon in points:
+            x, y = project(lat, lon)
+            self._xs.append(x)
+            self._ys.append(y)
+        self._segs = array("d")
+        for g_lat, g_lon, a_lat, a_lon in segments:
+            self._segs.extend(project(g_lat, g_lon) + project(a_lat, a_lon))
+        self._levels: "OrderedDict[int, Tuple[Dict[CellKey, Cluster], Dict[SegmentKey, Segment]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of points"""
+        return len(self._xs)
+
+    def is_built(self, zoom: int) -> bool:
+        """True if zoom's clusters and segments are cached (looking them up is then cheap)"""
+        with self._lock:
+            return zoom in self._levels
+
+    def build(self, zoom: int):
+        """Build and cache zoom's clusters and segments (safe to call off the Tk thread)"""
+        if self.is_built(zoom):
+            return
+        level = (self._build_clusters(zoom), self._build_segments(zoom))
+        with self._lock:
+            self._levels[zoom] = level
+            while len(self._levels) > self.max_zooms:
+                self._levels.popitem(last=False)
+
+    def _level(self, zoom: int) -> Tuple[Dict[CellKey, Cluster], Dict[SegmentKey, Segment]]:
+        """Cached clusters and segments at zoom, building them here if needed"""
+        while True:
+            with self._lock:
+                level = self._levels.get(zoom)
+                if level is not None:
+                    self._levels.move_to_end(zoom)
+                    return level
+            self.build(zoom)
+
+    def clusters(self, zoom: int) -> Dict[CellKey, Cluster]:
+        """All clusters at zoom, keyed by cell"""
+        return self._level(zoom)[0]
+
+    def segments(self, zoom: int) -> Dict[SegmentKey, Segment]:
+        """All bundled segments at zoom, keyed by (answer cell, sector)"""
+        return self._level(zoom)[1]
+
+    def _build_clusters(self, zoom: int) -> Dict[CellKey, Cluster]:
+        """Group points by grid cell"""
+        s = cell_scale(zoom, self.cell_px)
+        sums: Dict[CellKey, List[float]] = {}
+        for x, y in zip(self._xs, self._ys):
+            key = (int(x * s), int(y * s))
+            acc = sums.get(key)
+            if acc is None:
+                sums[key] = [1, x, y]
+            else:
+                acc[0] += 1
+                acc[1] += x
+                acc[2] += y
+        return {k: Cluster(k, int(n), sx / n, sy / n) for k, (n, sx, sy) in sums.items()}
+
+    def _build_segments(self, zoom: int) -> Dict[SegmentKey, Segment]:
+        """Bundle lines by answer cell and the direction their guess came from"""
+        s = cell_scale(zoom, self.cell_px)
+        per_sector = FAN_SECTORS / (2 * pi)
+        sums: Dict[SegmentKey, List[float]] = {}
+        segs = self._segs
+        for i in range(0, len(segs), 4):
+            x0, y0, x1, y1 = segs[i], segs[i + 1], segs[i + 2], segs[i + 3]
+            sector = int((atan2(y0 - y1, x0 - x1) + pi) * per_sector) % FAN_SECTORS
+            key = ((int(x1 * s), int(y1 * s)), sector)
+            acc = sums.get(key)
+            if acc is None:
+                sums[key] = [1, x0, y0, x1, y1]
+            else:
+                acc[0] += 1
+                acc[1] += x0
+                acc[2] += y0
+                acc[3] += x1
+                acc[4] += y1
+        return {k: Segment(k, int(n), a / n, b / n, c / n, d / n) for k, (n, a, b, c, d) in sums.items()}
+
+    def visible_clusters(self, zoom: int, x0: float, y0: float, x1: float, y1: float) -> Dict[CellKey, Cluster]:
+        """Clusters whose cell overlaps the world-space box (x0, y0)-(x1, y1)"""
+        clusters = self.clusters(zoom)
+        s = cell_scale(zoom, self.cell_px)
+        cx0, cy0, cx1, cy1 = int(x0 * s) - 1, int(y0 * s) - 1, int(x1 * s) + 1, int(y1 * s) + 1
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) < len(clusters):
+            # zoomed in: probe the cells on screen instead of scanning every cluster
+            out = {}
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    c = clusters.get((cx, cy))
+                    if c is not None:
+                        out[c.key] = c
+            return out
+        return {k: c for k, c in clusters.items() if cx0 <= k[0] <= cx1 and cy0 <= k[1] <= cy1}
+
+    def visible_segments(self, zoom: int, x0: float, y0: float, x1: float, y1: float,
+                         limit: int = MAX_VISIBLE_SEGMENTS) -> Dict[SegmentKey, Segment]:
+        """The limit heaviest segments whose bounding box overlaps the world-space box"""
+        hits = [sg for sg in self.segments(zoom).values()
+                if min(sg.x0, sg.x1) <= x1 and max(sg.x0, sg.x1) >= x0
+                and min(sg.y0, sg.y1) <= y1 and max(sg.y0, sg.y1) >= y0]
+        if len(hits) > limit:
+            hits = heapq.nlargest(limit, hits, key=lambda sg: sg.count)
+        return {sg.key: sg for sg in hits}
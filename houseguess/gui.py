@@ -6,17 +6,23 @@ Description: This file contains initialization functionality for HouseGuess
 """
 
 # Libraries (Requires: pip install pillow tkintermapview)
-import math
+from __future__ import annotations
 import os
+import queue
+import threading
 import tkinter as tk
+from .analytics import RoundStats, ScoreAnalytics
 from .api_client import rapidapi_search
+from .archive import open_archive
+from .clustering import CellKey, Cluster, ClusterIndex, Segment, SegmentKey
 from .models import Place, Photo, RapidAPIConfig
-from .util import haversine_km
-from __future__ import annotations
+from .monitor import EventLoopMonitor
+from .sampler import PlaceSampler
+from .util import PREVIEW_MAX_SIZE, CancelToken, download_img, haversine_km, photo_url, preview_size, score_by_distance_km
 from PIL import Image, ImageTk
 from tkinter import ttk, messagebox
 from tkintermapview import TkinterMapView
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
 # Windows DPI fix (MUST run before creating Tk)
 try:
@@ -34,7 +40,22 @@ LIGHT_GREEN = "#6FCF97"   # Connor: Switched from orange to green since it's my
 TEAL = "#4CA6A8"
 GRAY = "#333333"
 
+# Rounds drawn per session when playing from an offline place pool
+ROUNDS_PER_SESSION = 5
+
 # ---------------- Widgets ----------------
+def load_image(path: str) -> Image.Image:
+    """Decode image file for display (safe to call off the Tk thread)"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return Image.open(path).convert("RGB")
+
+def fit_image(img: Image.Image, width: int, height: int) -> Image.Image:
+    """Copy of img scaled down to fit width x height, keeping its aspect ratio"""
+    out = img.copy()
+    out.thumbnail((width, height))
+    return out
+
 class PhotoPanel(ttk.Frame):
     """Left panel that displays the current round image with safe resizing."""
     
@@ -49,16 +70,18 @@ class PhotoPanel(ttk.Frame):
         self._last_size: Tuple[int, int] = (0, 0)
         self._error: Optional[str] = None
 
+        # Progressive loading: full-res photos are fetched and decoded on a worker thread
+        self._loaded: "queue.Queue[tuple]" = queue.Queue()
+        self._generation = 0  # bumped per photo so late results from an old round are dropped
+        self._cancel: Optional[CancelToken] = None
+
     def set_image_path(self, path: str):
         """Set path to find image for left panel"""
         self._pil = None
         self._tk = None
         self._error = None
         try:
-            if not os.path.exists(path):
-                raise FileNotFoundError(path)
-            img = Image.open(path).convert("RGB")
-            self._pil = img
+            self._pil = load_image(path)
         except Exception as e:
             self._error = f"Image error:\n{e}"
         
@@ -66,6 +89,83 @@ class PhotoPanel(ttk.Frame):
         
         self._redraw()
 
+    def set_photo(self, photo: Photo, fetch: Callable[[str, CancelToken], str], cancel: Optional[CancelToken] = None):
+        """
+        Show photo's low-res preview right away (fetching it first if missing), then swap in full
+        resolution once fetch(url, token) has downloaded it. Cancelling cancel (or setting another
+        photo) abandons the download.
+        """
+        self._generation += 1
+        if self._cancel:
+            self._cancel.cancel()
+        self._cancel = None
+
+        if photo.file_path or not photo.url:
+            self.set_image_path(photo.file_path or photo.preview_path or "")
+            return
+        self._cancel = CancelToken(cancel)
+        if photo.preview_path:
+            self.set_image_path(photo.preview_path)
+        else:
+            self._pil = None
+            self._error = None
+            self._redraw()  # "Loading..." until the worker's preview arrives
+
+        worker = threading.Thread(target=self._load_full, args=(photo, fetch, self._cancel, self._generation), daemon=True)
+        worker.start()
+        self.after(50, self._poll_loaded)
+
+    def _load_full(self, photo: Photo, fetch, cancel: CancelToken, generation: int):
+        """
+        Worker thread: fetch the low-res variant first if the photo has no preview yet (e.g. places
+        harvested without previews), then full resolution, handing each to the Tk thread in order.
+        """
+        if not photo.preview_path:
+            try:
+                size = preview_size(photo.width, photo.height) if photo.width and photo.height \
+                    else (PREVIEW_MAX_SIZE, PREVIEW_MAX_SIZE)
+                if path := fetch(photo_url(photo.url, *size), cancel):
+                    self._loaded.put((generation, load_image(path), None, False))
+                    photo.preview_path = path
+            except Exception as e:
+                print(f"[DEBUG] Preview failed, waiting for full image: {e}")
+        img, error = None, None
+        try:
+            if path := fetch(photo.url, cancel):
+                img = load_image(path)
+                photo.file_path = path
+        except Exception as e:
+            error = f"Image error:\n{e}"
+        self._loaded.put((generation, img, error, True))
+
+    def _poll_loaded(self):
+        """Tk thread: show a fetched preview, then swap in full res (Tk objects must not be touched from workers)"""
+        try:
+            generation, img, error, final = self._loaded.get_nowait()
+        except queue.Empty:
+            if self._cancel and not self._cancel.cancelled:
+                self.after(50, self._poll_loaded)
+            return
+        if generation != self._generation or not final:
+            self.after(50, self._poll_loaded)  # stale result, or only the preview so far: keep waiting
+            if generation == self._generation and img is not None:
+                self._show(img)
+            return
+        self._cancel = None
+        if img is not None:
+            self._show(img)
+        elif self._pil is None:
+            self._error = error or "Image error:\nDownload failed"
+            self._redraw()
+        # else: keep showing the preview
+
+    def _show(self, img: Image.Image):
+        """Display an already decoded image"""
+        self._pil = img
+        self._error = None
+        self._last_size = (0, 0)
+        self._redraw()
+
     def _redraw(self):
         """Refresh left panel"""
         c = self.canvas
@@ -77,15 +177,164 @@ class PhotoPanel(ttk.Frame):
             c.create_text(w//2, h//2, text=self._error, fill=CREAM, font=("Segoe UI", 16), justify="center")
             return
         if self._pil is None:
-            c.create_text(w//2, h//2, text="(No image)", fill=CREAM, font=("Segoe UI", 16))
+            loading = self._cancel is not None and not self._cancel.cancelled
+            c.create_text(w//2, h//2, text="Loading..." if loading else "(No image)", fill=CREAM, font=("Segoe UI", 16))
             return
         if (w, h) != self._last_size:
-            img = self._pil.copy()
-            img.thumbnail((w - 12, h - 12))
-            self._tk = ImageTk.PhotoImage(img)
+            self._tk = ImageTk.PhotoImage(fit_image(self._pil, w - 12, h - 12))
             self._last_size = (w, h)
         c.create_image(w // 2, h // 2, image=self._tk)
 
+class ClusterLayer:
+    """
+    Draws a ClusterIndex straight onto a TkinterMapView canvas. Panning shifts the drawn items
+    with one canvas.move and only adds/removes clusters entering or leaving the view; a zoom or
+    resize redraws from the index's cached clusters for the new zoom level, which (along with its
+    neighbours) is built on a worker thread so the Tk thread never does the clustering itself.
+    """
+    PREBUILD_ZOOMS = (0, -1, 1, -2, 2)  # current zoom first, then the levels a scroll is likely to reach
+    POINT_TAG = "hg_cluster"
+    LINE_TAG = "hg_segment"
+
+    def __init__(self, map_view: TkinterMapView):
+        """Attach layer to map_view and follow its pan/zoom redraws"""
+        self.map = map_view
+        self.canvas = map_view.canvas
+        self.index: Optional[ClusterIndex] = None
+        self._points: Dict[CellKey, Tuple[int, ...]] = {}
+        self._lines: Dict[SegmentKey, int] = {}
+        self._view: Optional[Tuple[int, float, float]] = None  # (zoom, px per world unit x, y)
+        self._origin: Tuple[float, float] = (0.0, 0.0)
+        self._sync_id = None
+        self._builder: Optional[threading.Thread] = None
+
+        # TkinterMapView has no redraw callback, so follow its pan/zoom/resize redraws directly
+        for name in ("draw_move", "draw_zoom", "draw_initial_array"):
+            redraw = getattr(map_view, name, None)
+            if redraw is not None:
+                setattr(map_view, name, self._after_redraw(redraw))
+
+    def _after_redraw(self, redraw):
+        """Wrap one of the map's redraw methods so the layer refreshes after it"""
+        def wrapped(*args, **kwargs):
+            result = redraw(*args, **kwargs)
+            self.refresh()
+            return result
+        return wrapped
+
+    def set_index(self, index: Optional[ClusterIndex]):
+        """Show index (None clears the layer)"""
+        self.index = index
+        self._clear_items()
+        self.refresh()
+
+    def _clear_items(self):
+        """Remove every item drawn by the layer"""
+        self.canvas.delete(self.POINT_TAG)
+        self.canvas.delete(self.LINE_TAG)
+        self._points.clear()
+        self._lines.clear()
+        self._view = None
+
+    def _to_canvas(self, x: float, y: float) -> Tuple[float, float]:
+        """World position to canvas px for the current view"""
+        _, sx, sy = self._view
+        return (x - self._origin[0]) * sx, (y - self._origin[1]) * sy
+
+    def refresh(self):
+        """Bring drawn clusters in line with the map's current view"""
+        if self.index is None:
+            return
+        m = self.map
+        zoom = round(m.zoom)
+        n = 2 ** zoom
+        (ul_x, ul_y), (lr_x, lr_y) = m.upper_left_tile_pos, m.lower_right_tile_pos
+        if lr_x == ul_x or lr_y == ul_y:
+            return  # map not laid out yet
+        view = (zoom, m.width * n / (lr_x - ul_x), m.height * n / (lr_y - ul_y))
+        origin = (ul_x / n, ul_y / n)
+
+        if view != self._view:
+            self._clear_items()
+            self._view = view
+        elif origin != self._origin:
+            # pure pan: shift everything at once instead of recomputing each item
+            dx = (self._origin[0] - origin[0]) * view[1]
+            dy = (self._origin[1] - origin[1]) * view[2]
+            self.canvas.move(self.POINT_TAG, dx, dy)
+            self.canvas.move(self.LINE_TAG, dx, dy)
+        self._origin = origin
+        self._raise()  # tiles created by the redraw land on top
+
+        # a drag fires many redraws; add/remove items once it settles (moves above are immediate)
+        if self._sync_id is None:
+            self._sync_id = self.canvas.after(30, self._sync)
+
+    def _sync(self):
+        """Create/delete items so exactly the clusters and segments in view are drawn"""
+        self._sync_id = None
+        if self.index is None or self._view is None:
+            return
+        m = self.map
+        zoom, sx, sy = self._view
+        if not self.index.is_built(zoom):
+            self._prebuild(zoom)
+            self._sync_id = self.canvas.after(50, self._sync)  # draw once the worker has it
+            return
+        ox, oy = self._origin
+        box = (ox, oy, ox + m.width / sx, oy + m.height / sy)
+        self._sync_lines(self.index.visible_segments(zoom, *box))
+        self._sync_points(self.index.visible_clusters(zoom, *box))
+        self._raise()
+
+    def _prebuild(self, zoom: int):
+        """Build zoom and its neighbours on a worker thread (one at a time)"""
+        if self._builder is not None and self._builder.is_alive():
+            return
+        index = self.index
+        zooms = [zoom + d for d in self.PREBUILD_ZOOMS if 0 <= zoom + d <= 22]
+
+        def build():
+            for z in zooms:
+                index.build(z)
+
+        self._builder = threading.Thread(target=build, daemon=True)
+        self._builder.start()
+
+    def _raise(self):
+        """Keep the layer above the tiles, but below the map's own markers and buttons"""
+        self.canvas.tag_raise(self.LINE_TAG)
+        self.canvas.tag_raise(self.POINT_TAG)
+        if hasattr(self.map, "manage_z_order"):
+            self.map.manage_z_order()
+
+    def _sync_points(self, visible: Dict[CellKey, Cluster]):
+        """Create clusters that came into view, delete those that left"""
+        c = self.canvas
+        for key in self._points.keys() - visible.keys():
+            for item in self._points.pop(key):
+                c.delete(item)
+        for key in visible.keys() - self._points.keys():
+            cl = visible[key]
+            x, y = self._to_canvas(cl.x, cl.y)
+            r = cl.radius()
+            items = [c.create_oval(x - r, y - r, x + r, y + r, fill=TEAL, outline=CREAM, width=1, tags=self.POINT_TAG)]
+            if cl.count > 1:
+                items.append(c.create_text(x, y, text=str(cl.count), fill="white",
+                                           font=("Segoe UI", 9, "bold"), tags=self.POINT_TAG))
+            self._points[key] = tuple(items)
+
+    def _sync_lines(self, visible: Dict[SegmentKey, Segment]):
+        """Create segments that came into view, delete those that left"""
+        c = self.canvas
+        for key in self._lines.keys() - visible.keys():
+            c.delete(self._lines.pop(key))
+        for key in visible.keys() - self._lines.keys():
+            sg = visible[key]
+            x0, y0 = self._to_canvas(sg.x0, sg.y0)
+            x1, y1 = self._to_canvas(sg.x1, sg.y1)
+            self._lines[key] = c.create_line(x0, y0, x1, y1, fill=LIGHT_GREEN, width=sg.width(), tags=self.LINE_TAG)
+
 class ZoomMap(ttk.Frame):
     """Pan/zoom map using OpenStreetMap tiles. Accurate click marker with enable/disable."""
 
@@ -104,6 +353,21 @@ class ZoomMap(ttk.Frame):
         # Connor: Uses geo-click callback PTL for no pixel math amrite?
         self.map.add_left_click_map_command(self._on_left_click)
 
+        # Bulk markers for results/spectator replays (see set_bulk_markers)
+        self._layer = ClusterLayer(self.map)
+
+    def set_bulk_markers(self, points: Iterable[Tuple[float, float]],
+                         segments: Iterable[Tuple[float, float, float, float]] = ()):
+        """
+        Plot many (lat, lon) points as zoom-dependent clusters, plus optional
+        (guess_lat, guess_lon, answer_lat, answer_lon) lines, without one marker per point.
+        """
+        self._layer.set_index(ClusterIndex(points, segments))
+
+    def clear_bulk_markers(self):
+        """Remove everything drawn by set_bulk_markers"""
+        self._layer.set_index(None)
+
     def set_enabled(self, value: bool):
         """Enable or disable reacting to clicks."""
         self._enabled = bool(value)
@@ -204,15 +468,27 @@ class MainMenu(ttk.Frame):
         box.place(relx=0.5, rely=0.5, anchor="center")
 
         title = ttk.Label(box, style="Card.TLabel", text="HouseGuess", font=("Segoe UI", 56, "bold"))
-        start_btn = ttk.Button(box, text="Start", command=lambda: controller.start_session())
+        self.start_btn = ttk.Button(box, text="Start", command=lambda: controller.start_session())
         #Connor: Difficulty is kept on the main menu (placeholder)
         diff_btn = ttk.Button(box, text="Difficulty", command=self._set_difficulty)
         info_btn = ttk.Button(box, text="Info", command=lambda: controller.show("InfoScreen"))
+        self.status = tk.StringVar(value="")
+        status_lbl = ttk.Label(box, style="Card.TLabel", textvariable=self.status, font=("Segoe UI", 16))
 
         title.grid(row=0, column=0, pady=(48, 28), padx=32)
-        start_btn.grid(row=1, column=0, sticky="ew", padx=32, pady=18)
+        self.start_btn.grid(row=1, column=0, sticky="ew", padx=32, pady=18)
         diff_btn.grid(row=2, column=0, sticky="ew", padx=32, pady=18)
-        info_btn.grid(row=3, column=0, sticky="ew", padx=32, pady=(18, 48))
+        info_btn.grid(row=3, column=0, sticky="ew", padx=32, pady=(18, 8))
+        status_lbl.grid(row=4, column=0, padx=32, pady=(0, 40))
+
+    def set_loading(self, loading: bool):
+        """While places load, show a status line and turn Start into Cancel"""
+        if loading:
+            self.status.set("Loading places...")
+            self.start_btn.configure(text="Cancel", command=self.controller.cancel_downloads)
+        else:
+            self.status.set("")
+            self.start_btn.configure(text="Start", command=self.controller.start_session)
 
     def _set_difficulty(self):
         """Set difficulty setting in main menu"""
@@ -281,7 +557,7 @@ class GameScreen(ttk.Frame):
         # Preeth: Get the next available Place info and Photo.
         place = self.controller.places[self._round_idx]
         image = place.photos[0]
-        self.image.set_image_path(image.file_path)
+        self.image.set_photo(image, fetch=self.controller.fetch_photo, cancel=self.controller.downloads)
         self._answer = (place.lat, place.lon)
         self._pending_guess = None
         self._submitted = False
@@ -320,7 +596,7 @@ class GameScreen(ttk.Frame):
         g_lat, g_lon = self._pending_guess
         t_lat, t_lon = self._answer
         d = haversine_km(g_lat, g_lon, t_lat, t_lon)
-        score = int(5000 * math.exp(-d / 750.0))
+        score = score_by_distance_km(d)
         self.controls.set_feedback(distance_km=d, score=score)
 
         #Connor: lock the round,disable submit, disable map (no more guesses)
@@ -330,17 +606,20 @@ class GameScreen(ttk.Frame):
 
     def on_next(self):
         """Save score and advance round counter"""
+        place_id = self.controller.places[self._round_idx].id
         #Connor: If no submit, record 0 pts
         if self.controls.last_score is None:
-            self.controller.record_result(distance_km=0.0, score=0)
+            self.controller.record_result(distance_km=0.0, score=0, place_id=place_id, guessed=False)
         else:
             self.controller.record_result(
                 distance_km=self.controls.last_distance_km or 0.0,
-                score=self.controls.last_score
+                score=self.controls.last_score,
+                place_id=place_id,
+                guessed=self._pending_guess is not None
             )
         # Advance round index
         self._round_idx += 1
-        if self._round_idx < len(self.places):
+        if self._round_idx < len(self.controller.places):
             self.new_round()
 
 class ResultsScreen(ttk.Frame):
@@ -357,14 +636,23 @@ class ResultsScreen(ttk.Frame):
         self.summary.pack(pady=(0, 16))
         back_btn.pack()
 
-    def set_summary(self, rounds: int, total: int):
-        """Set summary value to be displayed in results screen"""
-        self.summary.config(text=f"Rounds Played: {rounds}\nTotal Score: {total}")
+    def set_summary(self, rounds: int, total: int, stats: Optional[Dict[str, Any]] = None):
+        """Set summary value to be displayed in results screen (stats: this game's RoundStats.summary())"""
+        text = f"Rounds Played: {rounds}\nTotal Score: {total}"
+        if stats and stats["rounds"]:
+            text += (f"\nMean Distance: {stats['mean_distance_km']:.0f} km"
+                     f"\nMedian: {stats['p50_distance_km']:.0f} km    |    p90: {stats['p90_distance_km']:.0f} km")
+        self.summary.config(text=text)
 
 # ---------------- App Shell ----------------
 class App(tk.Tk):
-    def __init__(self, config: RapidAPIConfig):
-        """Initialize App function"""
+    def __init__(self, config: RapidAPIConfig, monitor: bool = False, sampler: Optional[PlaceSampler] = None,
+                 analytics_path: Optional[str] = None):
+        """
+        Initialize App function. monitor=True records event-loop stalls and writes a report on exit.
+        With a sampler (offline place pool) rounds are drawn from it instead of a live search.
+        With analytics_path, this run's round analytics are merged into that file on exit.
+        """
         super().__init__()
         try:
             self.tk.call('tk', 'scaling', 1.0)
@@ -372,6 +660,15 @@ class App(tk.Tk):
             pass
 
         self.config = config
+        self.sampler = sampler
+        self.player = "local"
+        self.round_filters: Dict[str, Any] = {}  # country / category / difficulty band for the sampler
+        self.analytics = ScoreAnalytics()  # every round this run, merged into analytics_path on exit
+        self.analytics_path = analytics_path
+        self.session_stats = RoundStats()  # this game only, for the results screen
+        self.downloads = CancelToken()  # shared by the current round's photo downloads
+        self._session_loaded: "queue.Queue[tuple]" = queue.Queue()  # (token, places, error) from _load_session
+        self.archive = open_archive(config)
         self.title("HouseGuess")
         self.geometry("1366x860")
         self.minsize(1100, 700)
@@ -408,6 +705,7 @@ class App(tk.Tk):
         self.container.grid_columnconfigure(0, weight=1)
 
         self.frames = {}
+        self._current: Optional[str] = None  # name of the screen on top
         for F in (MainMenu, GameScreen, ResultsScreen, InfoScreen):
             frame = F(self.container, controller=self)
             self.frames[F.__name__] = frame
@@ -415,16 +713,47 @@ class App(tk.Tk):
 
         self.show("MainMenu")
 
+        # Opt-in event-loop lag monitor (UI_MONITOR=1)
+        self.monitor: Optional[EventLoopMonitor] = None
+        if monitor:
+            self.monitor = EventLoopMonitor(self)
+            self.monitor.start()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
         #Connor: game session state
         # self._places = []
         # self._rounds = len(self._places)
         # self._round_index = 0
         # self._total_score = 0
 
+    def _on_close(self):
+        """Write the stall report and save analytics before the window goes away"""
+        if self.monitor:
+            self.monitor.stop()
+            self.monitor.write_report()
+        if self.analytics_path and self.analytics.overall.distance_stats.count:
+            try:
+                self.analytics.save_merged(self.analytics_path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[DEBUG] Could not save analytics to {self.analytics_path}: {e}")
+        self.destroy()
+
     def show(self, name: str):
         """Show screen"""
+        if name == "MainMenu" and self._current in ("GameScreen", "ResultsScreen"):
+            self.cancel_downloads()  # leaving the game abandons its downloads (Info -> Back must not cancel a load)
+        self._current = name
         self.frames[name].tkraise()
 
+    def cancel_downloads(self):
+        """Stop photo downloads started for the current session and issue a fresh token"""
+        self.downloads.cancel()
+        self.downloads = CancelToken()
+
+    def fetch_photo(self, url: str, cancel: Optional[CancelToken] = None) -> str:
+        """Download a full-resolution photo (called from PhotoPanel's worker thread)"""
+        return download_img(url, timeout=self.config.timeout, cancel=cancel, archive=self.archive)
+
     def start_fixed_images_session(self):
         """New Round after reset"""
         # Connor: Reset and start with the fixed images
@@ -435,27 +764,75 @@ class App(tk.Tk):
         self._rounds = len(self.places)
         self._round_index = 0
         self._total_score = 0
+        self.session_stats = RoundStats()
         game: GameScreen = self.frames["GameScreen"]  # type: ignore
         game._round_idx = 0
         game.new_round()
         self.show("GameScreen")
 
     def start_session(self):
-        """Initial start to game"""
-        self.places = rapidapi_search(self.config, "places", country="USA")
+        """Initial start to game. Places load off the Tk thread so the window (and Cancel) stay responsive."""
+        self.cancel_downloads()
+        token = self.downloads
+        self.frames["MainMenu"].set_loading(True)
+        threading.Thread(target=self._load_session, args=(token,), name="houseguess-session", daemon=True).start()
+        self.after(50, self._poll_session, token)
+
+    def _load_session(self, token: CancelToken):
+        """Worker thread: pick this session's places"""
+        try:
+            if self.sampler is not None:
+                # no repeats within the session, and skip what this player saw recently
+                session = self.sampler.session(player=self.player, **self.round_filters)
+                places = []
+                while len(places) < ROUNDS_PER_SESSION and (place := session.draw()) is not None:
+                    if place.photos:
+                        places.append(place)
+            else:
+                places = rapidapi_search(self.config, "places", country="USA", cancel=token)
+            self._session_loaded.put((token, places, None))
+        except Exception as e:
+            self._session_loaded.put((token, None, e))
+
+    def _poll_session(self, token: CancelToken):
+        """Tk thread: start the game once the worker delivers places for the current token"""
+        if token.cancelled:
+            self.frames["MainMenu"].set_loading(False)
+            return  # cancelled, or superseded by another start_session
+        while True:
+            try:
+                loaded, places, error = self._session_loaded.get_nowait()
+            except queue.Empty:
+                self.after(50, self._poll_session, token)
+                return
+            if loaded is token:
+                break  # anything else is a late result from an abandoned load
+        self.frames["MainMenu"].set_loading(False)
+        if error is not None:
+            messagebox.showerror("HouseGuess", f"Could not load places:\n{error}")
+            return
+        if not places:
+            messagebox.showerror("HouseGuess", "No places found. Try again.")
+            return
+        self.places = places
         self._rounds = len(self.places)
         self._round_index = 0
         self._total_score = 0
+        self.session_stats = RoundStats()
         game: GameScreen = self.frames["GameScreen"]  # type: ignore
         game._round_idx = 0
         game.new_round()
         self.show("GameScreen")
 
-    def record_result(self, distance_km: float, score: int):
+    def record_result(self, distance_km: float, score: int, place_id: Optional[str] = None, guessed: bool = True):
         """Record score and show Results screen"""
         self._total_score += score
         self._round_index += 1
+        if guessed:
+            self.analytics.record(distance_km, score, player=self.player, place_id=place_id)
+            self.session_stats.add(distance_km, score)
         if self._round_index >= self._rounds:
-            self.frames["ResultsScreen"].set_summary(rounds=self._rounds, total=self._total_score)
+            self.frames["ResultsScreen"].set_summary(rounds=self._rounds, total=self._total_score,
+                                                     stats=self.session_stats.summary())
             self.show("ResultsScreen")
 
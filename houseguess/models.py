@@ -7,8 +7,24 @@ Description: This file contains classes that assist in HouseGuess operation
 
 # Libraries
 from __future__ import annotations
+import json
+import os
 from dataclasses import dataclass, field, asdict
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# API_MODE values: live hits the network, record also archives every response, replay serves only from the archive
+API_MODE_LIVE = "live"
+API_MODE_RECORD = "record"
+API_MODE_REPLAY = "replay"
+_API_MODES = {"0": API_MODE_LIVE, "1": API_MODE_RECORD, "2": API_MODE_REPLAY}
+
+def parse_api_mode(value: Optional[str]) -> str:
+    """Turn an API_MODE setting (0/1/2 or live/record/replay) into a mode name"""
+    mode = (value or "0").strip().lower()
+    mode = _API_MODES.get(mode, mode)
+    if mode not in _API_MODES.values():
+        raise ValueError(f"Unknown API_MODE {value!r}; expected 0/live, 1/record or 2/replay")
+    return mode
 
 @dataclass
 class RapidAPIConfig:
@@ -20,15 +36,35 @@ class RapidAPIConfig:
     endpoint: str
     search_path: str
     timeout: tuple
+    mode: str = API_MODE_LIVE
+    archive_dir: str = "assets/archive"
+    replay_latency: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> RapidAPIConfig:
+        """Build config from environment variables (override via .env)"""
+        host = os.getenv("RAPIDAPI_HOST", "maps-data.p.rapidapi.com")
+        return cls(
+            key=os.getenv("RAPIDAPI_KEY", ""),
+            host=host,
+            endpoint=os.getenv("RAPIDAPI_BASE", f"https://{host}"),
+            search_path=os.getenv("RAPIDAPI_SEARCH_PATH", "/searchmaps.php"),
+            timeout=(5, 20),
+            mode=parse_api_mode(os.getenv("API_MODE")),
+            archive_dir=os.getenv("API_ARCHIVE_DIR", "assets/archive"),
+            replay_latency=float(os.getenv("API_REPLAY_LATENCY", "0") or 0),
+        )
 
 @dataclass
 class Photo:
     """"Class to represent image to be utilized by HouseGuess"""
     
     # Instance variables
-    file_path: str
+    file_path: str  # full resolution, "" until it has been downloaded
     width: Optional[int] = None
     height: Optional[int] = None
+    url: Optional[str] = None  # full resolution source
+    preview_path: Optional[str] = None  # low-res variant shown while file_path loads
 
 @dataclass
 class Place:
@@ -48,6 +84,7 @@ class Place:
     website: Optional[str] = None
     reviews: Optional[int] = None
     rating: Optional[float] = None
+    difficulty: Optional[float] = None  # 0 (easy) to 1 (hard), used by round filters
 
     def coords(self) -> Tuple[float, float]:
         """Return coordinates of location"""
@@ -65,3 +102,24 @@ class Place:
     def to_dict(self) -> Dict[str, Any]:
         """Return place object as dictionary"""
         return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Place:
+        """Rebuild place from to_dict() output (e.g. a harvested dataset line)"""
+        d = dict(d)
+        d["photos"] = [Photo(**ph) for ph in d.get("photos") or []]
+        return cls(**d)
+
+def load_jsonl(path: str) -> Iterator[dict]:
+    """Parsed JSONL records from path (missing file = none)"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def read_dataset(path: str) -> Iterator[Place]:
+    """Places from a harvested dataset (see houseguess.tools.harvest)"""
+    for d in load_jsonl(path):
+        yield Place.from_dict(d)
@@ -0,0 +1,171 @@
+"""
+Project: HouseGuess
+Authors: Preeth Vijay, Haytham Moussa, Connor Pollack, Victor Ortiz Nazario, Sam Appiah, Collin Poag
+Date: 9/21/2025
+Description: This file contains an opt-in Tk event-loop latency monitor and stall profiler
+"""
+
+# Libraries
+from __future__ import annotations
+import heapq
+import itertools
+import linecache
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# A sampled stack: (filename, line number, function) from outermost to innermost frame
+Stack = Tuple[Tuple[str, int, str], ...]
+
+@dataclass
+class Stall:
+    """One period where the event loop did not run for longer than the threshold"""
+
+    started: datetime  # when the loop stopped running (the late heartbeat only notices at the end)
+    duration_ms: float
+    samples: Counter = field(default_factory=Counter)
+
+    def call_site(self) -> Optional[Stack]:
+        """Stack seen most often while the loop was stalled"""
+        if not self.samples:
+            return None
+        return self.samples.most_common(1)[0][0]
+
+class EventLoopMonitor:
+    """
+    Measures event-loop lag with after() heartbeats. A watchdog thread samples the main
+    thread's stack whenever a heartbeat is overdue by more than threshold_ms, so each stall
+    can be reported with the code that was blocking. Create and start it on the Tk thread.
+    """
+
+    def __init__(self, root, interval_ms: int = 50, threshold_ms: int = 200, sample_ms: int = 20,
+                 keep: int = 20, report_path: str = "assets/ui_stalls.txt"):
+        """Initialize monitor for root (anything with after/after_cancel)"""
+        self.root = root
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.sample_ms = sample_ms
+        self.keep = keep
+        self.report_path = report_path
+
+        self._main_id = threading.get_ident()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._after_id = None
+        self._last_beat = time.monotonic()
+        self._samples: Counter = Counter()
+        self._worst: List[Tuple[float, int, Stall]] = []  # min-heap of the `keep` longest stalls
+        self._seq = itertools.count()
+        self.lags_ms = deque(maxlen=10_000)
+        self.stall_count = 0
+
+    def start(self):
+        """Begin heartbeats and stack sampling"""
+        self._stop.clear()
+        self._last_beat = time.monotonic()
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+        self._thread = threading.Thread(target=self._watch, name="houseguess-ui-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop heartbeats and the sampling thread"""
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # root already destroyed
+            self._after_id = None
+
+    def _beat(self):
+        """Heartbeat on the Tk thread: measure how late it ran and close out any stall"""
+        now = time.monotonic()
+        elapsed_ms = (now - self._last_beat) * 1000.0
+        self._record(elapsed_ms - self.interval_ms)
+        self._last_beat = now
+        if not self._stop.is_set():
+            self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _record(self, lag_ms: float):
+        """Store one lag measurement, keeping it as a stall if it passed the threshold"""
+        lag_ms = max(0.0, lag_ms)
+        self.lags_ms.append(lag_ms)
+        with self._lock:
+            samples, self._samples = self._samples, Counter()
+        if lag_ms < self.threshold_ms:
+            return
+        self.stall_count += 1
+        stall = Stall(datetime.now() - timedelta(milliseconds=lag_ms), lag_ms, samples)
+        entry = (lag_ms, next(self._seq), stall)
+        if len(self._worst) < self.keep:
+            heapq.heappush(self._worst, entry)
+        elif lag_ms > self._worst[0][0]:
+            heapq.heapreplace(self._worst, entry)
+
+    def _watch(self):
+        """Watchdog thread: sample the main thread's stack while a heartbeat is overdue"""
+        limit = (self.interval_ms + self.threshold_ms) / 1000.0
+        while not self._stop.wait(self.sample_ms / 1000.0):
+            if time.monotonic() - self._last_beat < limit:
+                continue
+            frame = sys._current_frames().get(self._main_id)
+            if frame is None:
+                continue
+            # Walk the frames directly: no source lookups here, this competes with the stalled thread for the GIL
+            sites = []
+            while frame is not None:
+                sites.append((frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name))
+                frame = frame.f_back
+            stack: Stack = tuple(reversed(sites))
+            with self._lock:
+                self._samples[stack] += 1
+
+    def worst_stalls(self) -> List[Stall]:
+        """Longest stalls seen so far, worst first"""
+        return [s for _, _, s in sorted(self._worst, key=lambda e: (-e[0], e[1]))]
+
+    def percentile(self, q: float) -> float:
+        """Lag percentile (0-100) over recent heartbeats, in ms"""
+        if not self.lags_ms:
+            return 0.0
+        ordered = sorted(self.lags_ms)
+        return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+    def report(self) -> str:
+        """Readable summary of loop lag and the worst stalls with their call sites"""
+        lines = [
+            f"Event-loop monitor: {len(self.lags_ms)} heartbeats every {self.interval_ms} ms, "
+            f"stall threshold {self.threshold_ms} ms",
+            f"Lag p50={self.percentile(50):.1f} ms  p95={self.percentile(95):.1f} ms  "
+            f"p99={self.percentile(99):.1f} ms  max={max(self.lags_ms, default=0.0):.1f} ms",
+            f"Stalls: {self.stall_count}",
+        ]
+        for i, stall in enumerate(self.worst_stalls(), 1):
+            lines.append("")
+            lines.append(f"#{i} {stall.duration_ms:.0f} ms at {stall.started:%H:%M:%S} "
+                         f"({sum(stall.samples.values())} samples)")
+            site = stall.call_site()
+            if site is None:
+                lines.append("    (stall too short to sample)")
+                continue
+            for filename, lineno, name in site[-12:]:
+                lines.append(f"    {os.path.basename(filename)}:{lineno} in {name}")
+                if source := linecache.getline(filename, lineno).strip():
+                    lines.append(f"        {source}")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: Optional[str] = None) -> str:
+        """Write report() to path (default report_path) and return the path"""
+        path = path or self.report_path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report())
+        print(f"[DEBUG] UI stall report written to: {path}")
+        return path
@@ -0,0 +1,270 @@
+"""
+Project: HouseGuess
+Authors: Preeth Vijay, Haytham Moussa, Connor Pollack, Victor Ortiz Nazario, Sam Appiah, Collin Poag
+Date: 9/21/2025
+Description: This file contains the round sampler: weighted draws without replacement over a large place pool
+"""
+
+# Libraries
+from __future__ import annotations
+import random
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from .models import Place
+
+# Filtered pools kept at once (least recently used is dropped)
+MAX_CACHED_POOLS = 32
+
+class _Fenwick:
+    """Binary indexed tree over fixed weights. Read-only after build, so sessions can share it."""
+
+    def __init__(self, weights: List[float]):
+        """Build in O(n)"""
+        n = len(weights)
+        tree = [0.0] + list(weights)
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self.n = n
+        self.tree = tree
+        self.total = sum(weights)
+        self._top = 1 << max(0, n.bit_length() - 1) if n else 0
+
+    def prefix(self, i: int) -> float:
+        """Total weight of the first i positions"""
+        total = 0.0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, target: float, excluded: _Excluded) -> int:
+        """
+        0-based position whose cumulative weight first exceeds target, treating excluded positions
+        as weight 0. O(log n * log m) for m exclusions.
+        """
+        pos, step = 0, self._top
+        while step:
+            nxt = pos + step
+            if nxt <= self.n:
+                w = self.tree[nxt] - excluded.range_sum(pos, nxt)
+                if w <= target:
+                    pos = nxt
+                    target -= w
+            step >>= 1
+        return pos
+
+class _Excluded:
+    """Sorted positions (1-based) removed for one session, with prefix sums of their weights."""
+
+    def __init__(self):
+        """Initialize empty"""
+        self.positions: List[int] = []
+        self._prefix: List[float] = [0.0]
+
+    def __contains__(self, pos: int) -> bool:
+        """True if pos was removed"""
+        i = bisect_left(self.positions, pos)
+        return i < len(self.positions) and self.positions[i] == pos
+
+    @property
+    def total(self) -> float:
+        """Weight removed so far"""
+        return self._prefix[-1]
+
+    def add(self, pos: int, weight: float):
+        """Remove pos. O(m), fine for the few hundred exclusions a session holds."""
+        i = bisect_left(self.positions, pos)
+        self.positions.insert(i, pos)
+        self._prefix.insert(i + 1, self._prefix[i] + weight)
+        for j in range(i + 2, len(self._prefix)):
+            self._prefix[j] += weight
+
+    def extend(self, items: Iterable[Tuple[int, float]]):
+        """Remove many (pos, weight) at once in O(m log m)"""
+        merged = dict(zip(self.positions, (b - a for a, b in zip(self._prefix, self._prefix[1:]))))
+        merged.update(items)
+        self.positions = sorted(merged)
+        self._prefix = [0.0]
+        for pos in self.positions:
+            self._prefix.append(self._prefix[-1] + merged[pos])
+
+    def range_sum(self, lo: int, hi: int) -> float:
+        """Removed weight at positions in (lo, hi]"""
+        if not self.positions:
+            return 0.0
+        return self._prefix[bisect_right(self.positions, hi)] - self._prefix[bisect_right(self.positions, lo)]
+
+class _Pool:
+    """
+    Places of one (country, category), ordered by difficulty (unrated last) with a Fenwick tree
+    over their weights, so any difficulty band is a contiguous position range.
+    """
+
+    def __init__(self, places: List[Place], weights: List[float]):
+        """Build in O(k log k) for k matching places"""
+        order = sorted(range(len(places)), key=lambda i: (places[i].difficulty is None, places[i].difficulty or 0.0))
+        self.places = [places[i] for i in order]
+        self.weights = [weights[i] for i in order]
+        self.tree = _Fenwick(self.weights)
+        self.pos_by_id = {p.id: i for i, p in enumerate(self.places)}
+        self.difficulties = [p.difficulty for p in self.places if p.difficulty is not None]
+
+    def band(self, difficulty: Optional[Tuple[float, float]]) -> Tuple[int, int]:
+        """Positions [start, end) whose difficulty is in the inclusive band (None: every position)"""
+        if difficulty is None:
+            return 0, len(self.places)
+        lo, hi = difficulty
+        return bisect_left(self.difficulties, lo), bisect_right(self.difficulties, hi)
+
+class SamplerSession:
+    """One game's draws: never repeats a place, and skips places the player saw recently."""
+
+    def __init__(self, sampler: PlaceSampler, pool: _Pool, player: Optional[str], rng: random.Random,
+                 difficulty: Optional[Tuple[float, float]] = None):
+        """Initialize session over pool's difficulty band, excluding the player's recently seen places"""
+        self.sampler = sampler
+        self.pool = pool
+        self.player = player
+        self.rng = rng
+        self.start, self.end = pool.band(difficulty)
+        self._band_weight = pool.tree.prefix(self.end) - pool.tree.prefix(self.start)
+        self._drawn: List[int] = []
+        self._excluded = _Excluded()
+        recent = (pool.pos_by_id.get(pid) for pid in sampler.recent(player))
+        self._excluded.extend((pos + 1, pool.weights[pos]) for pos in recent
+                              if pos is not None and self.start <= pos < self.end)
+
+    def _exclude(self, pos: Optional[int]):
+        """Give pos weight 0 for the rest of the session"""
+        if pos is not None and pos + 1 not in self._excluded:
+            self._excluded.add(pos + 1, self.pool.weights[pos])
+
+    def remaining_weight(self) -> float:
+        """Total weight still drawable"""
+        return self._band_weight - self._excluded.total
+
+    def draw(self) -> Optional[Place]:
+        """Weighted draw without replacement in O(log n) (None once the band is exhausted)"""
+        if self.remaining_weight() <= 1e-12 and len(self._excluded.positions) > len(self._drawn):
+            # only recently seen places are left: let them back in rather than run dry
+            self._excluded = _Excluded()
+            self._excluded.extend((pos + 1, self.pool.weights[pos]) for pos in self._drawn)
+        tree = self.pool.tree
+        before = tree.prefix(self.start)  # every exclusion is inside the band, so nothing to subtract
+        for _ in range(8):
+            remaining = self.remaining_weight()
+            if remaining <= 1e-12:
+                return None
+            pos = tree.find(before + self.rng.random() * remaining, self._excluded)
+            # float error can land outside the band or on an excluded slot; just redraw
+            if self.start <= pos < self.end and self.pool.weights[pos] > 0 and pos + 1 not in self._excluded:
+                break
+        else:
+            return None
+        self._exclude(pos)
+        self._drawn.append(pos)
+        place = self.pool.places[pos]
+        self.sampler.mark_seen(self.player, place.id)
+        return place
+
+    def draw_many(self, k: int) -> List[Place]:
+        """Up to k draws"""
+        out = []
+        for _ in range(k):
+            place = self.draw()
+            if place is None:
+                break
+            out.append(place)
+        return out
+
+class PlaceSampler:
+    """
+    Round sampler over a large place pool. Places are indexed by country and category up front;
+    the pool for a (country, category) pair is built from the smaller index on first use and shared
+    by every session (the most recent max_pools are kept), and a difficulty band is just a position
+    range inside it, so starting a session and each draw cost sub-linear time.
+    """
+
+    def __init__(self, places: Iterable[Place], category_weights: Optional[Dict[str, float]] = None,
+                 default_weight: float = 1.0, recent_size: int = 200, seed: Optional[int] = None,
+                 max_pools: int = MAX_CACHED_POOLS):
+        """Initialize sampler. A place's weight is the largest weight of its categories (else default_weight)."""
+        self.places = list(places)
+        self.category_weights = {k.casefold(): v for k, v in (category_weights or {}).items()}
+        self.default_weight = default_weight
+        self.recent_size = recent_size
+        self.max_pools = max_pools
+        self._rng = random.Random(seed)
+        self._by_country: Dict[str, List[int]] = {}
+        self._by_category: Dict[str, List[int]] = {}
+        for i, p in enumerate(self.places):
+            self._by_country.setdefault((p.country or "").casefold(), []).append(i)
+            for c in {c.casefold() for c in p.categories}:
+                self._by_category.setdefault(c, []).append(i)
+        self._pools: "OrderedDict[Tuple[Optional[str], Optional[str]], _Pool]" = OrderedDict()
+        self._recent: Dict[str, OrderedDict] = {}
+        self._lock = threading.Lock()
+
+    def weight(self, place: Place) -> float:
+        """Draw weight of place"""
+        weights = [self.category_weights[c.casefold()] for c in place.categories if c.casefold() in self.category_weights]
+        return max(weights) if weights else self.default_weight
+
+    def _matching(self, country: Optional[str], category: Optional[str]) -> List[Place]:
+        """Places in country with category, read off the smaller of the two indexes"""
+        if country is None and category is None:
+            return self.places
+        if country is None:
+            return [self.places[i] for i in self._by_category.get(category, ())]
+        in_country = self._by_country.get(country, [])
+        if category is None:
+            return [self.places[i] for i in in_country]
+        in_category = self._by_category.get(category, [])
+        if len(in_country) <= len(in_category):
+            return [self.places[i] for i in in_country
+                    if category in (c.casefold() for c in self.places[i].categories)]
+        return [self.places[i] for i in in_category if (self.places[i].country or "").casefold() == country]
+
+    def _pool(self, country: Optional[str], category: Optional[str]) -> _Pool:
+        """Index for (country, category), built on first use"""
+        key = (country.casefold() if country else None, category.casefold() if category else None)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._pools.move_to_end(key)
+                return pool
+            matching = self._matching(*key)
+            pool = self._pools[key] = _Pool(matching, [self.weight(p) for p in matching])
+            while len(self._pools) > self.max_pools:
+                self._pools.popitem(last=False)
+            return pool
+
+    def session(self, player: Optional[str] = None, country: Optional[str] = None, category: Optional[str] = None,
+                difficulty: Optional[Tuple[float, float]] = None) -> SamplerSession:
+        """Start drawing rounds for player under the given filters (difficulty is an inclusive band)"""
+        pool = self._pool(country, category)
+        with self._lock:
+            rng = random.Random(self._rng.random())
+        return SamplerSession(self, pool, player, rng, difficulty)
+
+    def recent(self, player: Optional[str]) -> List[str]:
+        """Ids player has seen most recently (oldest first)"""
+        if player is None:
+            return []
+        with self._lock:
+            return list(self._recent.get(player, ()))
+
+    def mark_seen(self, player: Optional[str], place_id: str):
+        """Remember place_id for player, forgetting the oldest beyond recent_size"""
+        if player is None or self.recent_size <= 0:
+            return
+        with self._lock:
+            seen = self._recent.setdefault(player, OrderedDict())
+            seen.pop(place_id, None)
+            seen[place_id] = None
+            while len(seen) > self.recent_size:
+                seen.popitem(last=False)
@@ -0,0 +1,196 @@
+# Bulk place harvester: crawls a grid of queries x regions x zoom levels through rapidapi_search,
+# appending places to a JSONL dataset and checkpointing finished jobs so a crashed run can resume.
+#
+#   python -m houseguess.tools.harvest --query restaurant --query museum \
+#       --grid 25,-125,49,-67,2 --zoom 11 --zoom 13 --pages 3 --out assets/places.jsonl
+from __future__ import annotations
+import argparse, itertools, json, os, threading, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except Exception:
+    pass
+
+from houseguess.api_client import rapidapi_search
+from houseguess.models import Place, RapidAPIConfig, load_jsonl
+
+# (query, lat, lng, zoom, offset)
+Job = Tuple[str, float, float, int, int]
+
+def job_key(job: Job) -> str:
+    """Stable id for a job, as stored in the checkpoint file"""
+    q, lat, lng, zoom, offset = job
+    return f"{q}|{lat:.4f},{lng:.4f}|z{zoom}|o{offset}"
+
+def grid_regions(lat0: float, lng0: float, lat1: float, lng1: float, step: float) -> List[Tuple[float, float]]:
+    """Centers of a lat/lng grid covering the box with the given step (degrees)"""
+    lats = [lat0 + i * step for i in range(int((lat1 - lat0) / step) + 1)]
+    lngs = [lng0 + i * step for i in range(int((lng1 - lng0) / step) + 1)]
+    return [(round(a, 4), round(b, 4)) for a in lats for b in lngs]
+
+def build_jobs(queries: Iterable[str], regions: Iterable[Tuple[float, float]], zooms: Iterable[int],
+               pages: int = 1, limit: int = 20) -> Iterator[Job]:
+    """Lazily expand the crawl grid (never materialized, so it can be huge)"""
+    for q, (lat, lng), zoom, page in itertools.product(queries, regions, zooms, range(pages)):
+        yield (q, lat, lng, zoom, page * limit)
+
+class RateLimiter:
+    """Token bucket shared by all worker threads: at most `rate` calls per second, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_s = (1 - self._tokens) / self.rate
+            time.sleep(wait_s)
+
+def _repair_tail(path: str):
+    """Drop a half-written last line left by a crash so appends start on a clean line"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            start = max(0, pos - (1 << 16))
+            f.seek(start)
+            chunk = f.read(pos - start)
+            if pos == end and chunk.endswith(b"\n"):
+                return
+            cut = chunk.rfind(b"\n")
+            if cut >= 0:
+                f.truncate(start + cut + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+def _append(f, lines: List[str]):
+    """Append lines and force them to disk before the job is checkpointed"""
+    if lines:
+        f.write("".join(lines))
+    f.flush()
+    os.fsync(f.fileno())
+
+def harvest(config: RapidAPIConfig, jobs: Iterable[Job], out_path: str, checkpoint_path: Optional[str] = None,
+            workers: int = 4, rate: float = 5.0, limit: int = 20, retries: int = 3,
+            search: Callable[..., List[Place]] = rapidapi_search) -> Dict[str, int]:
+    """
+    Run jobs concurrently (within `rate` requests/second), appending new places to out_path as JSONL.
+    Finished jobs are recorded in checkpoint_path only after their places are on disk, so rerunning
+    the same command skips them; places already in the dataset are not written twice.
+    """
+    checkpoint_path = checkpoint_path or f"{out_path}.checkpoint"
+    for path in (out_path, checkpoint_path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        _repair_tail(path)
+
+    done: Set[str] = {d["job"] for d in load_jsonl(checkpoint_path)}
+    seen: Set[str] = {d["id"] for d in load_jsonl(out_path)}
+    stats = {"skipped": 0, "jobs": 0, "failed": 0, "places": 0, "duplicates": 0}
+    print(f"[HARVEST] resuming with {len(done)} finished job(s) and {len(seen)} place(s)")
+
+    limiter = RateLimiter(rate, burst=max(1, workers))
+
+    def run(job: Job) -> List[Place]:
+        q, lat, lng, zoom, offset = job
+        params = {"lat": lat, "lng": lng, "zoom": zoom, "offset": offset}
+        for attempt in range(retries + 1):
+            limiter.acquire()
+            try:
+                return search(config, q, limit=limit, extra_params=params, fetch_previews=False)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                print(f"[HARVEST] {job_key(job)} failed ({e}); retrying")
+                time.sleep(min(30.0, 2 ** attempt))
+        return []
+
+    def unfinished() -> Iterator[Job]:
+        """Jobs not in the checkpoint, counting the ones skipped (the checkpoint may cover other grids)"""
+        for job in jobs:
+            if job_key(job) in done:
+                stats["skipped"] += 1
+            else:
+                yield job
+
+    todo = unfinished()
+    with open(out_path, "a", encoding="utf-8") as out, open(checkpoint_path, "a", encoding="utf-8") as ckpt, \
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="houseguess-harvest") as pool:
+        pending = {}
+        while True:
+            # keep a bounded number of jobs in flight so huge grids are never queued in memory
+            for job in itertools.islice(todo, workers * 2 - len(pending)):
+                pending[pool.submit(run, job)] = job
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                job = pending.pop(fut)
+                try:
+                    places = fut.result()
+                except Exception as e:
+                    stats["failed"] += 1
+                    print(f"[HARVEST] giving up on {job_key(job)}: {e}")
+                    continue
+                lines = []
+                for p in places:
+                    if p.id in seen:
+                        stats["duplicates"] += 1
+                        continue
+                    seen.add(p.id)
+                    lines.append(json.dumps(p.to_dict(), ensure_ascii=False) + "\n")
+                _append(out, lines)
+                _append(ckpt, [json.dumps({"job": job_key(job), "count": len(lines)}) + "\n"])
+                stats["jobs"] += 1
+                stats["places"] += len(lines)
+                if stats["jobs"] % 100 == 0:
+                    print(f"[HARVEST] {stats['jobs']} job(s) done, {len(seen)} place(s) total")
+    return stats
+
+def _pair(s: str) -> Tuple[float, float]:
+    lat, lng = s.split(",")
+    return float(lat), float(lng)
+
+def main():
+    ap = argparse.ArgumentParser(description="Resumable bulk place harvester")
+    ap.add_argument("--query", action="append", required=True, help="search term (repeat)")
+    ap.add_argument("--region", action="append", default=[], type=_pair, help="center LAT,LNG (repeat)")
+    ap.add_argument("--grid", help="LAT0,LNG0,LAT1,LNG1,STEP box of region centers")
+    ap.add_argument("--zoom", action="append", type=int, default=[], help="zoom level (repeat, default 13)")
+    ap.add_argument("--pages", type=int, default=1, help="result pages per query/region/zoom")
+    ap.add_argument("--limit", type=int, default=20, help="results per page")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--rate", type=float, default=5.0, help="max requests per second")
+    ap.add_argument("--out", default="assets/places.jsonl")
+    ap.add_argument("--checkpoint", help="default: <out>.checkpoint")
+    args = ap.parse_args()
+
+    regions = list(args.region)
+    if args.grid:
+        lat0, lng0, lat1, lng1, step = (float(x) for x in args.grid.split(","))
+        regions += grid_regions(lat0, lng0, lat1, lng1, step)
+    if not regions:
+        ap.error("give at least one --region or --grid")
+
+    jobs = build_jobs(args.query, regions, args.zoom or [13], pages=args.pages, limit=args.limit)
+    stats = harvest(RapidAPIConfig.from_env(), jobs, args.out, args.checkpoint,
+                    workers=args.workers, rate=args.rate, limit=args.limit)
+    print(f"[HARVEST] done: {stats}")
+
+if __name__ == "__main__":
+    main()
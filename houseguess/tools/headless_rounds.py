@@ -1,5 +1,5 @@
 from __future__ import annotations
-import os, random, time
+import os, time
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -7,7 +7,11 @@ except Exception:
     pass
 
 from houseguess.api_client import rapidapi_search
-from houseguess.models import Place
+from houseguess.models import Place, RapidAPIConfig, read_dataset
+from houseguess.sampler import PlaceSampler, SamplerSession
+
+# API_MODE=2 replays a recorded archive, so this runs offline and the same way every time
+CONFIG = RapidAPIConfig.from_env()
 
 API_DEFAULT_PARAMS = {
     "country": "us",
@@ -18,17 +22,24 @@ API_DEFAULT_PARAMS = {
     "zoom": "13",
 }
 
-def one_round(q="restaurant") -> Place:
-    places = rapidapi_search(q, limit=20, extra_params=API_DEFAULT_PARAMS)
-    if not places:
-        raise RuntimeError("No places from API")
-    p = random.choice(places)
+def one_round(session: SamplerSession) -> Place:
+    p = session.draw()
+    if p is None:
+        raise RuntimeError("No places left to draw")
     country = p.country or "Unknown"
     cats = ",".join(p.categories) if p.categories else "-"
     print(f"[ROUND] {p.name} - {country} @ {p.lat:.5f},{p.lon:.5f} cats={cats}")
     return p
 
 if __name__ == "__main__":
+    # PLACES_DATASET=<harvested .jsonl> samples offline; otherwise one live/replayed search is the pool
+    if dataset := os.getenv("PLACES_DATASET"):
+        places = list(read_dataset(dataset))
+    else:
+        places = rapidapi_search(CONFIG, "restaurant", limit=20, extra_params=API_DEFAULT_PARAMS, fetch_previews=False)
+    if not places:
+        raise RuntimeError("No places from API")
+    session = PlaceSampler(places).session()
     for i in range(3):
-        one_round()
+        one_round(session)
         time.sleep(0.2)
@@ -8,9 +8,28 @@ Description: This file contains functionality to take API data and use it in Hou
 # Libraries
 import os
 import requests
-import shutil
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
 from datetime import datetime
-from math import radians, sin, cos, asin, sqrt
+from math import radians, sin, cos, asin, sqrt, exp
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Set, Tuple, Union
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from .archive import ApiArchive
+
+# Download defaults (seconds). DOWNLOAD_TIMEOUT matches RapidAPIConfig.timeout: (connect, read).
+DOWNLOAD_TIMEOUT = (5, 20)
+DOWNLOAD_DEADLINE = 30.0
+HEDGE_DEFAULT_DELAY = 1.5
+_POLL_INTERVAL = 0.1
+_CHUNK_SIZE = 64 * 1024
+
+# Longest side (px) of the low-res variant shown while the full photo loads
+PREVIEW_MAX_SIZE = 160
 
 def haversine_km(a_lat: float, a_lon: float, b_lat: float, b_lon: float) -> float:
     """Great-circle distance in kilometers."""
@@ -21,17 +40,293 @@ def haversine_km(a_lat: float, a_lon: float, b_lat: float, b_lon: float) -> floa
     h = sin(dlat / 2) ** 2 + cos(la1) * cos(la2) * sin(dlon / 2) ** 2
     return 2 * R * asin(sqrt(h))
 
-def download_img(url: str) -> str:
-    """ Returns filename for an image after downloading it, if successful."""
-    prefix = "assets/images"
-    if not os.path.isdir(prefix):
-        os.makedirs(prefix)
+def score_by_distance_km(distance_km: float) -> int:
+    """Round score: 5000 for an exact guess, decaying with distance."""
+    return int(5000 * exp(-distance_km / 750.0))
+
+def photo_url(url: str, width: int, height: int) -> str:
+    """Rewrite the size suffix of a photo URL (...=w{width}-h{height}) to request another variant"""
+    suffix = url.rindex("=")
+    return f"{url[:suffix + 1]}w{width}-h{height}"
+
+def preview_size(width: int, height: int, max_size: int = PREVIEW_MAX_SIZE) -> Tuple[int, int]:
+    """Dimensions of the low-res preview, keeping the aspect ratio of width x height"""
+    scale = min(1.0, max_size / max(width, height, 1))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+class CancelToken:
+    """Flag shared by every download of a round so an abandoned round can stop them."""
+
+    def __init__(self, parent: Optional["CancelToken"] = None):
+        """Initialize token in the not-cancelled state. Cancelling parent also cancels this token."""
+        self._event = threading.Event()
+        self._parent = parent
+
+    def cancel(self):
+        """Ask every download holding this token to stop"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() has been called on this token or its parent"""
+        return self._event.is_set() or (self._parent is not None and self._parent.cancelled)
+
+class DownloadAbandoned(Exception):
+    """Raised internally when a download is cancelled or runs past its deadline."""
+
+class _LatencyTracker:
+    """Rolling window of successful download times, used to pick the hedge delay."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20, default: float = HEDGE_DEFAULT_DELAY):
+        """Initialize empty window"""
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+        self.default = default
+
+    def add(self, seconds: float):
+        """Record the time a download took"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def p95(self) -> float:
+        """95th percentile of recent downloads (default until enough samples are seen)"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return self.default
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+_latency = _LatencyTracker()
+_save_lock = threading.Lock()  # filenames are count based, so concurrent saves must not interleave
+_live_lock = threading.Lock()
+_attempt = threading.local()  # adapter of the attempt running on this thread (see _AttemptAdapter)
+
+class _AttemptAdapter(HTTPAdapter):
+    """
+    Transport for a single download attempt. close() from another thread hangs up the attempt's
+    connection, so it stops even while still waiting for the response headers.
+    """
+
+    def __init__(self):
+        """Initialize with no connections (and no retries: hedging already covers that)"""
+        self._sockets: List[socket.socket] = []
+        self._closed = False
+        self._lock = threading.Lock()
+        super().__init__(max_retries=0)
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Open connections through _TrackedHTTPConnection / _TrackedHTTPSConnection"""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TrackedHTTPPool, "https": _TrackedHTTPSPool}
+
+    def track(self, sock: socket.socket):
+        """Remember a freshly connected socket (hung up at once if the attempt was already aborted)"""
+        with self._lock:
+            if not self._closed:
+                self._sockets.append(sock)
+                return
+        _hang_up(sock)
+
+    def close(self):
+        """Hang up every connection, then release the pool"""
+        with self._lock:
+            self._closed = True
+            sockets, self._sockets = self._sockets, []
+        for sock in sockets:
+            _hang_up(sock)
+        super().close()
+
+def _hang_up(sock: socket.socket):
+    """Shut sock down, waking any thread blocked reading from it"""
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
 
+def _track_connection(sock: socket.socket):
+    """Register sock with the attempt running on this thread"""
+    adapter = getattr(_attempt, "adapter", None)
+    if adapter is not None:
+        adapter.track(sock)
+
+class _TrackedHTTPConnection(HTTPConnection):
+    """HTTP connection that reports its socket to the current attempt"""
+
+    def connect(self):
+        """Connect, then register the socket"""
+        super().connect()
+        _track_connection(self.sock)
+
+class _TrackedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection that reports its socket to the current attempt"""
+
+    def connect(self):
+        """Connect, then register the socket"""
+        super().connect()
+        _track_connection(self.sock)
+
+class _TrackedHTTPPool(HTTPConnectionPool):
+    """Pool opening _TrackedHTTPConnection"""
+    ConnectionCls = _TrackedHTTPConnection
+
+class _TrackedHTTPSPool(HTTPSConnectionPool):
+    """Pool opening _TrackedHTTPSConnection"""
+    ConnectionCls = _TrackedHTTPSConnection
+
+def _spawn(fn, *args) -> Future:
+    """
+    Run fn(*args) on its own daemon thread. Attempts stuck on a slow host then never starve
+    other downloads of a worker, as they could with a fixed size pool.
+    """
+    future: Future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True, name="houseguess-download").start()
+    return future
+
+def _fetch(url: str, timeout, deadline: float, stop: threading.Event, cancel: Optional[CancelToken],
+           live: List[requests.Session]) -> bytes:
+    """
+    Single download attempt. Gives up between chunks if stopped, cancelled, or past the deadline,
+    and never waits on the socket past the deadline. The attempt's session is kept in live so the
+    caller can abort it mid-request instead of waiting for the socket to time out.
+    """
+    if stop.is_set() or (cancel is not None and cancel.cancelled):
+        raise DownloadAbandoned("cancelled")  # e.g. a hedge whose twin already finished
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DownloadAbandoned("deadline exceeded")
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+    started = time.monotonic()
+    session = requests.Session()
+    adapter = _AttemptAdapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    with _live_lock:
+        live.append(session)
+    _attempt.adapter = adapter
     try:
-        response = requests.get(url, stream=True)
+        if stop.is_set():
+            raise DownloadAbandoned("cancelled")  # aborted before it was registered
+        with session.get(url, stream=True, timeout=(min(connect, left), min(read, left))) as response:
+            # Verifies status == 200.
+            response.raise_for_status()
+            chunks = []
+            for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                if stop.is_set() or (cancel is not None and cancel.cancelled):
+                    raise DownloadAbandoned("cancelled")
+                if time.monotonic() > deadline:
+                    raise DownloadAbandoned("deadline exceeded")
+                chunks.append(chunk)
+    except requests.exceptions.RequestException:
+        if stop.is_set() or (cancel is not None and cancel.cancelled):
+            raise DownloadAbandoned("cancelled")  # the hang up, not the host, broke the request
+        raise
+    finally:
+        _attempt.adapter = None
+        with _live_lock:
+            if session in live:
+                live.remove(session)
+        session.close()
+    _latency.add(time.monotonic() - started)
+    return b"".join(chunks)
 
-        # Verifies status == 200.
-        response.raise_for_status() 
+def _abort_all(live: List[requests.Session]):
+    """Abort every attempt still running"""
+    with _live_lock:
+        sessions = list(live)
+    for session in sessions:
+        session.close()
+
+class _Download:
+    """Hedged attempts for one URL within a _fetch_many batch"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.stop = threading.Event()
+        self.live: List[requests.Session] = []
+        self.pending: Set[Future] = set()
+        self.hedged = False
+        self.result: Union[bytes, BaseException, None] = None
+
+    def finish(self, result: Union[bytes, BaseException]):
+        """Record the outcome and abort any attempt still running"""
+        self.result = result
+        self.stop.set()
+        _abort_all(self.live)
+
+def _fetch_many(urls: List[str], timeout, deadline_s: float, hedge_after: Optional[float],
+                cancel: Optional[CancelToken]) -> List[Union[bytes, BaseException]]:
+    """
+    Fetch every url at once, one thread per attempt, under one deadline. Each url gets a second
+    attempt if the first has not answered after hedge_after seconds (or failed early); whichever
+    finishes first wins and the other is aborted. Returns bytes or the error for each url.
+    """
+    now = time.monotonic()
+    deadline = now + deadline_s
+    hedge_at = now + (_latency.p95() if hedge_after is None else hedge_after)
+    downloads = [_Download(url) for url in urls]
+    owner: Dict[Future, _Download] = {}
+
+    def launch(d: _Download):
+        attempt = _spawn(_fetch, d.url, timeout, deadline, d.stop, cancel, d.live)
+        owner[attempt] = d
+        d.pending.add(attempt)
+
+    for d in downloads:
+        launch(d)
+    try:
+        while True:
+            active = [d for d in downloads if d.result is None]
+            if not active:
+                break
+            if cancel is not None and cancel.cancelled:
+                for d in active:
+                    d.finish(DownloadAbandoned("cancelled"))
+                break
+            now = time.monotonic()
+            if now >= deadline:
+                for d in active:
+                    d.finish(DownloadAbandoned("deadline exceeded"))
+                break
+            for d in active:
+                if not d.hedged and (now >= hedge_at or not d.pending):
+                    launch(d)
+                    d.hedged = True
+            wait_for = min(_POLL_INTERVAL, deadline - now)
+            if any(not d.hedged for d in active):
+                wait_for = min(wait_for, max(0.0, hedge_at - now))
+            done, _ = wait(set(owner), timeout=wait_for, return_when=FIRST_COMPLETED)
+            for attempt in done:
+                d = owner.pop(attempt)
+                d.pending.discard(attempt)
+                if d.result is not None:
+                    continue
+                if attempt.exception() is None:
+                    d.finish(attempt.result())
+                elif d.hedged and not d.pending:
+                    d.finish(attempt.exception())  # both attempts failed
+    finally:
+        # losing (or cancelled) attempts must not hold a connection until their socket times out
+        for d in downloads:
+            d.stop.set()
+            _abort_all(d.live)
+    return [d.result for d in downloads]
+
+def _save_img(data: bytes) -> str:
+    """Write image bytes under assets/images and return the path"""
+    prefix = "assets/images"
+    with _save_lock:
+        if not os.path.isdir(prefix):
+            os.makedirs(prefix)
 
         # Generate date based filename for image.
         now = datetime.now()
@@ -40,15 +335,52 @@ def download_img(url: str) -> str:
         file_name = f"{formatted_string}_{count + 1}.png"
 
         # Save image.
-        save_path = f"assets/images/{file_name}"
+        save_path = f"{prefix}/{file_name}"
         with open(save_path, 'wb') as out_file:
-            shutil.copyfileobj(response.raw, out_file)
+            out_file.write(data)
+    return save_path
+
+def download_img(url: str, timeout=DOWNLOAD_TIMEOUT, deadline: float = DOWNLOAD_DEADLINE,
+                 hedge_after: Optional[float] = None, cancel: Optional[CancelToken] = None,
+                 archive: Optional[ApiArchive] = None) -> str:
+    """
+    Returns filename for an image after downloading it, if successful.
+
+    The whole download must finish within deadline seconds. If the first request has not
+    answered by hedge_after seconds (default: p95 of recent downloads) a second request is
+    started and the first to finish is used. Cancelling the token stops the download.
+    A recording archive keeps a copy; a replaying archive serves the image with no network.
+    """
+    return download_imgs([url], timeout, deadline, hedge_after, cancel, archive)[0]
 
-        print(f"[DEBUG] Image successfully downloaded to: {save_path}")
-        return save_path
-    except requests.exceptions.RequestException as e:
-        print(f"[DEBUG] Error downloading image: {e}")
-    except IOError as e:
-        print(f"[DEBUG] Error saving image to file: {e}")
+def download_imgs(urls: List[str], timeout=DOWNLOAD_TIMEOUT, deadline: float = DOWNLOAD_DEADLINE,
+                  hedge_after: Optional[float] = None, cancel: Optional[CancelToken] = None,
+                  archive: Optional[ApiArchive] = None) -> List[str]:
+    """
+    Download all urls concurrently (see download_img) under one shared deadline, so a batch
+    takes about as long as its slowest image rather than the sum. Returns a path or "" per url.
+    """
+    paths = [""] * len(urls)
+    if archive is not None and archive.replaying:
+        for i, (url, path) in enumerate(zip(urls, archive.image_paths(list(urls)))):
+            if path is None:
+                print(f"[DEBUG] No recorded image for {url}")
+            paths[i] = path or ""
+        return paths
 
-    return ""
+    results = _fetch_many(list(urls), timeout, deadline, hedge_after, cancel) if urls else []
+    for i, (url, data) in enumerate(zip(urls, results)):
+        try:
+            if isinstance(data, BaseException):
+                raise data
+            if archive is not None and archive.recording:
+                archive.save_image(url, data)
+            paths[i] = _save_img(data)
+            print(f"[DEBUG] Image successfully downloaded to: {paths[i]}")
+        except DownloadAbandoned as e:
+            print(f"[DEBUG] Image download abandoned ({e}): {url}")
+        except requests.exceptions.RequestException as e:
+            print(f"[DEBUG] Error downloading image: {e}")
+        except IOError as e:
+            print(f"[DEBUG] Error saving image to file: {e}")
+    return paths
@@ -0,0 +1,70 @@
+# Micro-benchmark harness. Benchmarks only run with HOUSEGUESS_BENCH=1:
+#
+#   HOUSEGUESS_BENCH=1 python -m pytest tests/benchmarks            # compare against baselines
+#   HOUSEGUESS_BENCH=1 HOUSEGUESS_BENCH_UPDATE=1 python -m pytest tests/benchmarks   # re-record
+#
+# A benchmark fails when its best per-call time is more than HOUSEGUESS_BENCH_THRESHOLD
+# (default 0.25 = 25%) slower than the stored baseline. Baselines are per machine; point
+# HOUSEGUESS_BENCH_BASELINES at a different file to keep one per CI runner / kiosk.
+import json
+import os
+import timeit
+
+import pytest
+
+ENABLED = os.getenv("HOUSEGUESS_BENCH", "0") == "1"
+UPDATE = os.getenv("HOUSEGUESS_BENCH_UPDATE", "0") == "1"
+THRESHOLD = float(os.getenv("HOUSEGUESS_BENCH_THRESHOLD", "0.25"))
+BASELINES = os.getenv("HOUSEGUESS_BENCH_BASELINES", os.path.join(os.path.dirname(__file__), "baselines.json"))
+
+_results = {}
+
+class Bench:
+    """Times a callable and checks it against its stored baseline."""
+
+    def __init__(self, baselines):
+        self.baselines = baselines
+        self.dirty = False
+
+    def __call__(self, name, fn, repeat=5):
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()  # enough calls for ~0.2 s per repeat
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+        base = self.baselines.get(name)
+        _results[name] = (best, base)
+        if base is None or UPDATE:
+            self.baselines[name] = best
+            self.dirty = True
+            return best
+        assert best <= base * (1 + THRESHOLD), (
+            f"{name} regressed: {best * 1e6:.2f} us/call vs baseline {base * 1e6:.2f} us "
+            f"(+{(best / base - 1):.0%}, limit +{THRESHOLD:.0%})"
+        )
+        return best
+
+@pytest.fixture(scope="session")
+def _bench_session():
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+    session = Bench(baselines)
+    yield session
+    if session.dirty:
+        with open(BASELINES, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(session.baselines.items())), f, indent=2)
+            f.write("\n")
+
+@pytest.fixture
+def bench(_bench_session):
+    if not ENABLED:
+        pytest.skip("set HOUSEGUESS_BENCH=1 to run benchmarks")
+    return _bench_session
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks (best us/call)")
+    for name, (best, base) in sorted(_results.items()):
+        change = "new baseline" if base is None else f"{best / base - 1:+.0%} vs baseline"
+        terminalreporter.write_line(f"{name:<32} {best * 1e6:>12.3f}  {change}")
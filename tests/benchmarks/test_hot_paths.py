@@ -0,0 +1,77 @@
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from houseguess import api_client as api
+from houseguess import util
+from houseguess.clustering import ClusterIndex
+from houseguess.models import Photo, Place
+from houseguess.sampler import PlaceSampler
+
+SAMPLE_ITEM = {
+    "place_id": "ChIJ123",
+    "name": "Foo Cafe",
+    "full_address": "1 Main St, Springfield, IL 62701, United States",
+    "geometry": {"location": {"lat": 39.7817, "lng": -89.6501}},
+    "types": ["cafe", "bakery"],
+}
+
+def test_haversine_km(bench):
+    bench("haversine_km", lambda: util.haversine_km(48.8566, 2.3522, 51.5072, -0.1276))
+
+def test_extract_lat_lon(bench):
+    bench("_extract_lat_lon", lambda: api._extract_lat_lon(SAMPLE_ITEM))
+
+def test_pick(bench):
+    bench("_pick", lambda: api._pick(SAMPLE_ITEM, "formatted_address", "address", "full_address", default=""))
+
+def test_place_to_dict(bench):
+    place = Place("ChIJ123", "Foo Cafe", "US", 39.78, -89.65, "https://maps.example/foo", address="1 Main St",
+                  categories=["cafe", "bakery"], photos=[Photo("assets/images/a.png", 1200, 800, "https://x/a=w1200-h800")])
+    bench("Place.to_dict", place.to_dict)
+
+def test_sampler_draw(bench):
+    places = [Place(f"p{i}", "x", "US", 0.0, 0.0, "", categories=["cafe"]) for i in range(100_000)]
+    sampler = PlaceSampler(places, recent_size=200, seed=1)
+    bench("PlaceSampler session+5 draws", lambda: sampler.session(player="p").draw_many(5))
+
+def test_cluster_build(bench):
+    rng = random.Random(1)
+    points = [(rng.uniform(-60, 60), rng.uniform(-170, 170)) for _ in range(50_000)]
+    bench("ClusterIndex 50k zoom build", lambda: ClusterIndex(points).clusters(6), repeat=3)
+
+@pytest.fixture(scope="module")
+def image_server():
+    """Local HTTP server returning a fixed 256 KB payload"""
+    payload = bytes(range(256)) * 1024
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/photo=w1200-h800"
+    httpd.shutdown()
+
+def test_download_img(bench, image_server, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    bench("download_img 256KB local", lambda: util.download_img(image_server, hedge_after=10.0), repeat=3)
+    capsys.readouterr()  # drop per-download debug lines
+
+def test_photo_decode_and_scale(bench, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    pytest.importorskip("tkinter")
+    pytest.importorskip("tkintermapview")
+    from houseguess import gui
+    path = tmp_path / "photo.png"
+    Image.effect_noise((2000, 1500), 64).convert("RGB").save(path)
+    bench("PhotoPanel decode+fit", lambda: gui.fit_image(gui.load_image(str(path)), 1268, 788), repeat=3)
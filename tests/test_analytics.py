@@ -0,0 +1,96 @@
+import random
+
+from houseguess.analytics import QuantileSketch, RoundStats, ScoreAnalytics
+
+def exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+def test_sketch_quantiles_within_relative_error():
+    rng = random.Random(1)
+    values = [rng.expovariate(1 / 800.0) for _ in range(20000)] + [0.0] * 50
+    sketch = QuantileSketch(alpha=0.01)
+    for v in values:
+        sketch.add(v)
+    for q in (0.5, 0.9, 0.99):
+        assert abs(sketch.quantile(q) - exact(values, q)) <= 0.02 * exact(values, q)
+    assert sketch.quantile(0.0) == 0.0
+
+def test_sketch_memory_is_bounded():
+    sketch = QuantileSketch(alpha=0.01, max_buckets=64)
+    for i in range(1, 100000):
+        sketch.add(i * 0.37)
+    assert len(sketch.buckets) <= 64
+    assert abs(sketch.quantile(0.99) - 0.99 * 99999 * 0.37) < 0.02 * 99999 * 0.37
+
+def test_merge_across_processes_matches_single_stream():
+    rng = random.Random(2)
+    rounds = [(rng.uniform(0, 5000), rng.randint(0, 5000), rng.choice("ab"), f"p{rng.randint(0, 9)}") for _ in range(3000)]
+    whole, left, right = ScoreAnalytics(), ScoreAnalytics(), ScoreAnalytics()
+    for i, (d, s, player, place) in enumerate(rounds):
+        whole.record(d, s, player=player, place_id=place)
+        (left if i % 2 else right).record(d, s, player=player, place_id=place)
+
+    # the halves travel as JSON, as they would between processes
+    merged = ScoreAnalytics.from_dict(left.to_dict())
+    merged.merge(ScoreAnalytics.from_dict(right.to_dict()))
+
+    for player in (None, "a", "b"):
+        a, b = whole.summary(player), merged.summary(player)
+        assert a["rounds"] == b["rounds"]
+        assert abs(a["mean_distance_km"] - b["mean_distance_km"]) < 1e-6
+        assert a["p90_distance_km"] == b["p90_distance_km"]
+    assert [h[0] for h in whole.hardest_places(3)] == [h[0] for h in merged.hardest_places(3)]
+
+def test_hardest_places_and_place_cap():
+    analytics = ScoreAnalytics(max_places=100)
+    for _ in range(5):
+        analytics.record(4000.0, 100, place_id="far")
+        analytics.record(10.0, 4900, place_id="near")
+    for i in range(500):
+        analytics.record(50.0, 4000, place_id=f"once{i}")
+    assert analytics.hardest_places(1) == [("far", 4000.0, 5)]
+    assert len(analytics.places) <= 110
+
+def test_game_stats_are_separate_from_all_time():
+    analytics = ScoreAnalytics()
+    for d in (5000.0, 6000.0, 7000.0):
+        analytics.record(d, 10, player="local")
+    game = RoundStats()
+    for d in (10.0, 20.0):
+        analytics.record(d, 4900, player="local")
+        game.add(d, 4900)
+    assert game.summary()["rounds"] == 2 and game.summary()["mean_distance_km"] == 15.0
+    assert analytics.summary("local")["rounds"] == 5
+
+def test_new_places_displace_stale_ones_when_full():
+    analytics = ScoreAnalytics(max_places=1000)
+    for _ in range(3):
+        for i in range(1000):
+            analytics.record(5.0, 4990, place_id=f"easy{i}")
+    for i in range(1500):
+        analytics.record(50.0, 4000, place_id=f"once{i}")
+        if i % 150 == 0:
+            analytics.record(9000.0, 0, place_id="new")
+    # plays before it first survived a trim are lost, but the place is kept from then on
+    (pid, mean, rounds), = analytics.hardest_places(1)
+    assert pid == "new" and mean == 9000.0 and rounds >= 5
+    assert len(analytics.places) <= 1100
+
+def test_eviction_ranks_survive_round_trip():
+    analytics = ScoreAnalytics(max_places=10)
+    for i in range(30):
+        analytics.record(float(i), 100, player="p", place_id=f"x{i}")
+    again = ScoreAnalytics.from_dict(analytics.to_dict())
+    assert again.to_dict() == analytics.to_dict()
+
+def test_save_merged_accumulates_across_runs(tmp_path):
+    path = str(tmp_path / "stats" / "analytics.json")
+    for run in range(3):
+        analytics = ScoreAnalytics()
+        for d in (100.0, 200.0):
+            analytics.record(d, 4000, player="local", place_id=f"p{run}")
+        analytics.save_merged(path)
+    total = ScoreAnalytics.load(path)
+    assert total.summary()["rounds"] == 6 and total.summary("local")["mean_distance_km"] == 150.0
+    assert len(total.places) == 3
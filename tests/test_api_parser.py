@@ -1,5 +1,8 @@
 import responses
 from houseguess.api_client import rapidapi_search
+from houseguess.models import RapidAPIConfig
+
+CONFIG = RapidAPIConfig("test-key", "maps-data.p.rapidapi.com", "https://maps-data.p.rapidapi.com", "/searchmaps.php", (5, 20))
 
 @responses.activate
 def test_rapidapi_parser_basic():
@@ -20,8 +23,16 @@ def test_rapidapi_parser_basic():
         json=fake,
         status=200,
     )
-    places = rapidapi_search("Foo", limit=1)
+    places = rapidapi_search(CONFIG, "Foo", limit=1)
     assert len(places) == 1
     p = places[0]
     assert p.name == "Foo Cafe" and p.country == "US"
     assert abs(p.lat - 34.05) < 1e-6 and abs(p.lon - (-118.24)) < 1e-6
+
+@responses.activate
+def test_rapidapi_fallback_id_is_stable():
+    fake = {"results": [{"name": "No Id Diner", "geometry": {"location": {"lat": 40.7128, "lng": -74.006}}}]}
+    responses.add(responses.GET, "https://maps-data.p.rapidapi.com/searchmaps.php", json=fake, status=200)
+    first = rapidapi_search(CONFIG, "Diner", limit=1)[0]
+    second = rapidapi_search(CONFIG, "Diner", limit=1)[0]
+    assert first.id == second.id == "rapidapi:40.71280,-74.00600:No Id Diner"
@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from houseguess.archive import ApiArchive, ArchiveMiss, open_archive
+from houseguess.models import RapidAPIConfig, parse_api_mode
+from houseguess.util import download_imgs
+
+def test_parse_api_mode():
+    assert parse_api_mode("0") == "live"
+    assert parse_api_mode("1") == "record"
+    assert parse_api_mode(" Replay ") == "replay"
+    assert parse_api_mode(None) == "live"
+    with pytest.raises(ValueError):
+        parse_api_mode("3")
+
+def test_record_then_replay(tmp_path):
+    rec = ApiArchive(str(tmp_path), mode="record")
+    rec.save_search("https://x/searchmaps.php", {"query": "cafe", "limit": 5}, {"results": [{"name": "Foo"}]})
+    img = rec.save_image("https://img/a=w10-h10", b"pixels")
+
+    rep = ApiArchive(str(tmp_path), mode="replay")
+    # param order must not matter
+    assert rep.load_search("https://x/searchmaps.php", {"limit": 5, "query": "cafe"}) == {"results": [{"name": "Foo"}]}
+    assert rep.image_path("https://img/a=w10-h10") == img
+    with pytest.raises(ArchiveMiss):
+        rep.load_search("https://x/searchmaps.php", {"query": "bar"})
+
+def test_live_mode_has_no_archive():
+    config = RapidAPIConfig("k", "h", "https://h", "/s", (5, 20))
+    assert open_archive(config) is None
+
+def test_replay_latency_is_paid_once_per_batch(tmp_path):
+    rec = ApiArchive(str(tmp_path), mode="record")
+    urls = [f"https://img/{i}=w10-h10" for i in range(15)]
+    for url in urls:
+        rec.save_image(url, b"pixels")
+
+    rep = ApiArchive(str(tmp_path), mode="replay", latency=0.2)
+    start = time.monotonic()
+    paths = download_imgs(urls + ["https://img/missing=w10-h10"], archive=rep)
+    assert time.monotonic() - start < 0.5  # one 0.2 s delay, not sixteen
+    assert all(paths[:15]) and paths[15] == ""
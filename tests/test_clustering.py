@@ -0,0 +1,60 @@
+import random
+
+from houseguess.clustering import FAN_SECTORS, MAX_VISIBLE_SEGMENTS, ClusterIndex, project
+
+def test_project_bounds():
+    assert project(0, 0) == (0.5, 0.5)
+    x, y = project(90, 180)  # clamped to the mercator limit
+    assert x == 1.0 and abs(y) < 1e-6
+
+def test_clusters_merge_when_zoomed_out():
+    rng = random.Random(1)
+    pts = [(40 + rng.random() * 0.01, -100 + rng.random() * 0.01) for _ in range(1000)]
+    pts.append((-33.9, 151.2))
+    index = ClusterIndex(pts)
+
+    far = index.clusters(2)
+    assert sorted(c.count for c in far.values()) == [1, 1000]
+    near = index.clusters(18)
+    assert sum(c.count for c in near.values()) == 1001 and len(near) > 2
+
+def test_visible_clusters_match_full_scan():
+    rng = random.Random(2)
+    index = ClusterIndex([(rng.uniform(-60, 60), rng.uniform(-170, 170)) for _ in range(5000)])
+    box = (*project(45, -10), *project(35, 10))  # (x0, y0) top-left, (x1, y1) bottom-right
+    for zoom in (3, 9):
+        got = index.visible_clusters(zoom, *box)
+        s = 256 * 2 ** zoom / index.cell_px
+        want = {k for k in index.clusters(zoom)
+                if int(box[0] * s) - 1 <= k[0] <= int(box[2] * s) + 1 and int(box[1] * s) - 1 <= k[1] <= int(box[3] * s) + 1}
+        assert set(got) == want
+
+def test_segments_bundle_per_answer_and_direction():
+    segs = [(40.0, -100.0, 41.0, -99.0)] * 3 + [(39.0, -101.0, 41.0, -99.0)] + [(10.0, 10.0, 41.0, -99.0)]
+    index = ClusterIndex(segments=segs)
+    agg = index.segments(4)
+    assert sorted(sg.count for sg in agg.values()) == [1, 4]
+    assert len({answer for answer, _ in agg}) == 1
+
+def test_visible_segments_stay_bounded():
+    rng = random.Random(3)
+    segs = [(rng.uniform(-60, 60), rng.uniform(-170, 170), rng.uniform(-60, 60), rng.uniform(-170, 170))
+            for _ in range(50000)]
+    index = ClusterIndex(segments=segs)
+    world = (0.0, 0.0, 1.0, 1.0)
+    for zoom in (3, 8):
+        assert len(index.segments(zoom)) <= FAN_SECTORS * len({a for a, _ in index.segments(zoom)})
+        visible = index.visible_segments(zoom, *world)
+        assert len(visible) == MAX_VISIBLE_SEGMENTS
+        # the heaviest bundles are the ones kept
+        assert min(sg.count for sg in visible.values()) >= \
+            sorted((sg.count for sg in index.segments(zoom).values()), reverse=True)[MAX_VISIBLE_SEGMENTS - 1]
+
+def test_zoom_cache_is_bounded():
+    index = ClusterIndex([(0.0, 0.0), (10.0, 10.0)], max_zooms=3)
+    for zoom in range(8):
+        index.build(zoom)
+    assert [z for z in range(8) if index.is_built(z)] == [5, 6, 7]
+    index.clusters(6)  # touched, so 5 is evicted next
+    index.build(0)
+    assert [z for z in range(8) if index.is_built(z)] == [0, 6, 7]
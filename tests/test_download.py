@@ -0,0 +1,126 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from houseguess.util import CancelToken, download_img, download_imgs, photo_url, preview_size
+
+PAYLOAD = b"\x89PNG fake image bytes"
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    First request to /tail stalls, later ones answer at once. /slow always stalls.
+    /half* answers after 0.5 s. /mute never sends headers. /trickle dribbles one byte at a time (never hitting the read timeout) until the client hangs up.
+    """
+    hits = 0
+    hung_up = threading.Event()
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path == "/mute":
+            time.sleep(30.0)
+            return
+        if self.path == "/trickle":
+            self.send_response(200)
+            self.send_header("Content-Length", "1000000")
+            self.end_headers()
+            try:
+                for _ in range(400):
+                    self.wfile.write(b"x")
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                type(self).hung_up.set()
+            return
+        if self.path == "/slow" or (self.path == "/tail" and type(self).hits == 1):
+            time.sleep(2.0)
+        elif self.path.startswith("/half"):
+            time.sleep(0.5)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _Handler.hits = 0
+    _Handler.hung_up = threading.Event()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+def test_hedged_request_beats_slow_first_attempt(server):
+    start = time.monotonic()
+    path = download_img(f"{server}/tail", hedge_after=0.1)
+    assert time.monotonic() - start < 1.5
+    with open(path, "rb") as f:
+        assert f.read() == PAYLOAD
+    assert _Handler.hits == 2
+
+def test_deadline_gives_up(server):
+    start = time.monotonic()
+    assert download_img(f"{server}/slow", deadline=0.3, hedge_after=0.1) == ""
+    assert time.monotonic() - start < 1.0
+
+def test_cancelled_token_stops_download(server):
+    token = CancelToken()
+    token.cancel()
+    assert download_img(f"{server}/tail", cancel=token) == ""
+
+def test_batch_downloads_run_concurrently(server):
+    start = time.monotonic()
+    paths = download_imgs([f"{server}/half{i}" for i in range(6)], hedge_after=10.0)
+    assert time.monotonic() - start < 1.5  # one 0.5 s wait, not six
+    assert all(paths) and len(set(paths)) == 6
+
+def test_batch_shares_one_deadline(server):
+    start = time.monotonic()
+    paths = download_imgs([f"{server}/slow"] * 5 + [f"{server}/half"], deadline=1.0, hedge_after=10.0)
+    assert time.monotonic() - start < 1.6
+    assert paths[:5] == [""] * 5 and paths[5]
+
+def test_cancel_aborts_stalled_read(server):
+    token = CancelToken()
+    threading.Timer(0.3, token.cancel).start()
+    assert download_img(f"{server}/trickle", cancel=token, hedge_after=10.0) == ""
+    # the attempt's connection is closed right away instead of holding a pool thread
+    assert _Handler.hung_up.wait(2.0)
+
+def test_cancelled_header_waits_do_not_starve_other_downloads(server):
+    token = CancelToken()
+    stuck = [threading.Thread(target=download_img, args=(f"{server}/mute",), kwargs={"cancel": token, "hedge_after": 10.0})
+             for _ in range(16)]
+    for t in stuck:
+        t.start()
+    time.sleep(0.3)
+    start = time.monotonic()
+    token.cancel()
+    for t in stuck:
+        t.join(2.0)
+        assert not t.is_alive()  # aborted while still waiting for headers
+    assert time.monotonic() - start < 1.0
+    assert download_img(f"{server}/half", deadline=2.0, hedge_after=10.0)
+
+def test_header_wait_ends_at_deadline(server):
+    start = time.monotonic()
+    assert download_img(f"{server}/mute", deadline=0.5, hedge_after=10.0) == ""
+    assert time.monotonic() - start < 1.0
+
+def test_parent_token_cancels_child():
+    parent = CancelToken()
+    child = CancelToken(parent)
+    parent.cancel()
+    assert child.cancelled
+
+def test_preview_variant_url():
+    url = "https://lh5.googleusercontent.com/p/AF1Q=w1200-h800"
+    assert preview_size(1200, 800) == (160, 107)
+    assert preview_size(100, 50) == (100, 50)
+    assert photo_url(url, *preview_size(1200, 800)) == "https://lh5.googleusercontent.com/p/AF1Q=w160-h107"
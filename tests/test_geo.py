@@ -1,10 +1,13 @@
-
-from houseguess.geo import haversine_km, score_by_distance_km
+from houseguess.util import haversine_km, score_by_distance_km
 
 def test_haversine_zero():
-    assert abs(haversine_km((0,0),(0,0))) < 1e-6
+    assert abs(haversine_km(0, 0, 0, 0)) < 1e-6
+
+def test_haversine_known_distance():
+    # Paris -> London is roughly 344 km
+    assert abs(haversine_km(48.8566, 2.3522, 51.5072, -0.1276) - 344) < 5
 
 def test_score_bounds():
-    assert score_by_distance_km(0) == 1000
+    assert score_by_distance_km(0) == 5000
     assert score_by_distance_km(10000) == 0
     assert score_by_distance_km(20000) == 0  # clamped
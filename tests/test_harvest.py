@@ -0,0 +1,34 @@
+from houseguess.models import Place, RapidAPIConfig, read_dataset
+from houseguess.tools.harvest import build_jobs, harvest, job_key
+
+CONFIG = RapidAPIConfig("k", "h", "https://h", "/s", (5, 20))
+
+def fake_search(config, query, limit=20, extra_params=None, fetch_previews=True):
+    # same place shows up for every zoom level, so it must be de-duplicated
+    return [Place(f"{query}-{extra_params['lat']}", query, "US", extra_params["lat"], extra_params["lng"], "")]
+
+def test_harvest_resumes_from_checkpoint(tmp_path):
+    out = str(tmp_path / "places.jsonl")
+    jobs = list(build_jobs(["cafe", "museum"], [(1.0, 2.0), (3.0, 4.0)], [11, 13]))
+    assert len(jobs) == 8
+
+    stats = harvest(CONFIG, jobs[:5], out, workers=2, rate=1000, search=fake_search)
+    assert stats["jobs"] == 5
+
+    # simulate a crash mid-write, then rerun the whole grid
+    with open(out, "a", encoding="utf-8") as f:
+        f.write('{"id": "half')
+    calls = []
+    def counting_search(*args, **kwargs):
+        calls.append(kwargs["extra_params"])
+        return fake_search(*args, **kwargs)
+    stats = harvest(CONFIG, jobs, out, workers=2, rate=1000, search=counting_search)
+    assert stats["skipped"] == 5 and stats["jobs"] == 3 and len(calls) == 3
+
+    places = list(read_dataset(out))
+    assert sorted(p.id for p in places) == ["cafe-1.0", "cafe-3.0", "museum-1.0", "museum-3.0"]
+    assert job_key(jobs[0]) == "cafe|1.0000,2.0000|z11|o0"
+
+    # a smaller grid only counts its own finished jobs as skipped
+    stats = harvest(CONFIG, jobs[:2], out, workers=2, rate=1000, search=counting_search)
+    assert stats["skipped"] == 2 and stats["jobs"] == 0
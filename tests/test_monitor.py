@@ -0,0 +1,38 @@
+import time
+from datetime import datetime, timedelta
+
+from houseguess.monitor import EventLoopMonitor
+
+class FakeRoot:
+    """Stands in for Tk: after() just remembers the callback."""
+    def after(self, ms, fn):
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        pass
+
+def blocking_work():
+    time.sleep(0.4)
+
+def test_stall_is_recorded_with_call_site(tmp_path):
+    mon = EventLoopMonitor(FakeRoot(), interval_ms=10, threshold_ms=100, sample_ms=10)
+    mon.start()
+    try:
+        mon._beat()
+        blocked_at = datetime.now()
+        blocking_work()
+        mon._beat()
+        mon._beat()
+    finally:
+        mon.stop()
+
+    assert mon.stall_count == 1
+    worst = mon.worst_stalls()[0]
+    assert worst.duration_ms >= 300
+    assert any(name == "blocking_work" for _, _, name in worst.call_site())
+    assert abs(worst.started - blocked_at) < timedelta(milliseconds=100)
+
+    path = mon.write_report(str(tmp_path / "stalls.txt"))
+    with open(path, encoding="utf-8") as f:
+        report = f.read()
+    assert "blocking_work" in report and "time.sleep(0.4)" in report
@@ -0,0 +1,42 @@
+import queue
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("tkintermapview")
+
+from houseguess import gui
+from houseguess.models import Photo
+from houseguess.util import CancelToken
+
+def test_preview_is_fetched_before_full_resolution(tmp_path):
+    small, full = tmp_path / "small.png", tmp_path / "full.png"
+    Image.new("RGB", (160, 107)).save(small)
+    Image.new("RGB", (1200, 800)).save(full)
+    photo = Photo("", 1200, 800, url="https://img.example/p/abc=w1200-h800")
+
+    fetched = []
+    def fetch(url, cancel):
+        fetched.append(url)
+        return str(small if url.endswith("w160-h107") else full)
+
+    panel = SimpleNamespace(_loaded=queue.Queue())
+    gui.PhotoPanel._load_full(panel, photo, fetch, CancelToken(), 7)
+
+    assert fetched == ["https://img.example/p/abc=w160-h107", "https://img.example/p/abc=w1200-h800"]
+    first, second = panel._loaded.get_nowait(), panel._loaded.get_nowait()
+    assert (first[0], first[1].size, first[3]) == (7, (160, 107), False)
+    assert (second[0], second[1].size, second[3]) == (7, (1200, 800), True)
+    assert photo.preview_path == str(small) and photo.file_path == str(full)
+
+def test_existing_preview_is_not_fetched_again(tmp_path):
+    full = tmp_path / "full.png"
+    Image.new("RGB", (1200, 800)).save(full)
+    photo = Photo("", 1200, 800, url="https://img.example/p/abc=w1200-h800", preview_path="already.png")
+    fetched = []
+    panel = SimpleNamespace(_loaded=queue.Queue())
+    gui.PhotoPanel._load_full(panel, photo, lambda url, cancel: fetched.append(url) or str(full), CancelToken(), 1)
+    assert fetched == ["https://img.example/p/abc=w1200-h800"]
+    assert panel._loaded.get_nowait()[3] is True
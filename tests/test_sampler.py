@@ -0,0 +1,51 @@
+from collections import Counter
+
+from houseguess.models import Place
+from houseguess.sampler import PlaceSampler
+
+def make_places(n=100):
+    return [Place(f"p{i}", f"Place {i}", "US" if i % 2 else "FR", 0.0, 0.0, "",
+                  categories=["cafe" if i % 3 else "museum"], difficulty=i / n) for i in range(n)]
+
+def test_draws_without_replacement_until_exhausted():
+    session = PlaceSampler(make_places(50), seed=1).session()
+    drawn = session.draw_many(60)
+    assert len(drawn) == 50
+    assert len({p.id for p in drawn}) == 50
+    assert session.draw() is None
+
+def test_constraints_filter_pool():
+    sampler = PlaceSampler(make_places(), seed=2)
+    drawn = sampler.session(country="us", category="museum", difficulty=(0.2, 0.6)).draw_many(100)
+    assert drawn
+    for p in drawn:
+        assert p.country == "US" and "museum" in p.categories and 0.2 <= p.difficulty <= 0.6
+
+def test_category_weights_bias_first_draw():
+    sampler = PlaceSampler(make_places(30), category_weights={"museum": 50.0}, seed=3)
+    first = Counter(sampler.session().draw().categories[0] for _ in range(500))
+    # 10 museums at weight 50 vs 20 cafes at weight 1
+    assert first["museum"] > 400
+
+def test_recently_seen_are_skipped_per_player():
+    sampler = PlaceSampler(make_places(20), recent_size=10, seed=4)
+    first = {p.id for p in sampler.session(player="ann").draw_many(10)}
+    second = {p.id for p in sampler.session(player="ann").draw_many(10)}
+    assert not first & second
+    # another player is unaffected, and an exhausted pool lets recent places back in
+    assert len(sampler.session(player="bob").draw_many(20)) == 20
+    assert len(sampler.session(player="ann").draw_many(20)) == 20
+
+def test_difficulty_bands_share_one_pool():
+    sampler = PlaceSampler(make_places(), seed=5)
+    for lo in (0.0, 0.3, 0.5, 0.8):
+        drawn = sampler.session(country="FR", difficulty=(lo, lo + 0.1)).draw_many(100)
+        assert drawn and all(p.country == "FR" and lo <= p.difficulty <= lo + 0.1 for p in drawn)
+    assert len(sampler._pools) == 1
+
+def test_pool_cache_is_bounded():
+    places = [Place(f"p{i}", "", f"C{i % 50}", 0.0, 0.0, "", categories=["cafe"]) for i in range(500)]
+    sampler = PlaceSampler(places, max_pools=8, seed=6)
+    for c in range(50):
+        assert len(sampler.session(country=f"c{c}", category="CAFE").draw_many(20)) == 10
+    assert len(sampler._pools) == 8